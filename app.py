@@ -1,10 +1,35 @@
 import streamlit as st
 import pandas as pd
 import google.generativeai as genai
-import json
-import re
-import random
-from time import sleep
+from google.generativeai import client as genai_client
+import threading
+import uuid
+from collections import OrderedDict
+from functools import partial, wraps
+from time import perf_counter, thread_time
+
+from concurrent.futures import as_completed
+
+from config import (
+    BATCH_SIZE, CEFR_LEVELS, GEMINI_API_ENDPOINT, HEDGE_DEFAULT_DELAY, HEDGE_MIN_SAMPLES, HEDGE_PERCENTILE,
+    MAX_BATCH_PARALLEL, MAX_BATCH_SIZE, MAX_DUPLICATE_RETRIES, NEXT_WORD_POLL_SECONDS, TABLE_PAGE_CACHE_SIZE,
+    TABLE_PAGE_SIZES, VOCAB_DB_PATH, WORD_FIELDS,
+)
+from example_cache import ExampleCache
+from exporter import EXPORT_FORMATS, export_bytes
+from history_store import HistoryStore
+from latency import LatencyRecorder
+from llm_cache import CachingModel, ResponseCache, generate_fresh
+from metrics import MeteredModel, Metrics
+from persistence import VocabularyDatabase
+from prefetch import WordPrefetcher
+from request_engine import RateLimitedModel, RequestEngine
+from response_parser import parse_words
+from search_index import SearchIndex
+from vocabulary_store import DUPLICATE_REASONS, VocabularyStore, WordCollection, word_key
+from word_pool import SharedWordPool
+from word_sources import GeminiWordSource, LocalWordSource
+from word_table import shared_table
 
 # Configure the page
 st.set_page_config(
@@ -13,27 +38,21 @@ st.set_page_config(
     layout="wide"
 )
 
-# Word generation prompt template with level support
-WORD_GENERATION_PROMPT = """
-Generate 1 German vocabulary word{category_prompt}{level_prompt} with its English translation.
-Make sure the word is NOT one of these existing words: {existing_words}
+# Batch word generation prompt template
+WORD_BATCH_GENERATION_PROMPT = """
+Generate {count} different German vocabulary words{category_prompt}{level_prompt} with their English translations.
+Make sure none of the words is one of these existing words: {existing_words}{letters_prompt}
 
-For the word, provide:
+For each word, provide:
 1. The German word (include the article der/die/das for nouns)
 2. The English translation
 3. The article (der/die/das) if it's a noun, otherwise leave blank
 4. The category (animals, food, places, verbs, etc.)
-5. The CEFR level (A1, A2, B1, B2, C1, C2) - where:
-   - A1: Absolute beginner vocabulary (very basic, everyday words)
-   - A2: Elementary vocabulary (common, everyday expressions)
-   - B1: Intermediate vocabulary (familiar matters, work, school, leisure)
-   - B2: Upper intermediate vocabulary (complex topics, technical discussions)
-   - C1: Advanced vocabulary (complex texts, implicit meaning, specialized)
-   - C2: Proficiency vocabulary (very advanced, nuanced, academic)
-
-Format the response as JSON with these exact keys: "german", "english", "article", "category", "level"
+5. The CEFR level (A1, A2, B1, B2, C1, C2)
+
+Format the response as a JSON array of objects with these exact keys: "german", "english", "article", "category", "level"
 Example format:
-{{"german": "der Hund", "english": "dog", "article": "der", "category": "animals", "level": "A1"}}
+[{{"german": "der Hund", "english": "dog", "article": "der", "category": "animals", "level": "A1"}}]
 """
 
 # Example sentences prompt template
@@ -46,8 +65,10 @@ English: [translation]
 Make the sentences appropriate for a {level} level German learner.
 """
 
-# Define CEFR levels and their descriptions
-CEFR_LEVELS = ["A1", "A2", "B1", "B2", "C1", "C2"]
+# Bump when EXAMPLE_SENTENCES_PROMPT changes so cached examples are regenerated
+EXAMPLE_SENTENCES_PROMPT_VERSION = 1
+
+# CEFR level descriptions
 LEVEL_DESCRIPTIONS = {
     "A1": "Absolute beginner vocabulary (very basic, everyday words)",
     "A2": "Elementary vocabulary (common, everyday expressions)",
@@ -57,6 +78,13 @@ LEVEL_DESCRIPTIONS = {
     "C2": "Proficiency vocabulary (very advanced, nuanced, academic)"
 }
 
+# Initial letters split between parallel batch generation calls; every letter a German word
+# can start with, so each one is covered by some batch
+INITIAL_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÜ"
+
+# Word sources offered in the sidebar
+WORD_SOURCE_LABELS = {"gemini": "Gemini", "local": "Bundled word lists"}
+
 # Article color mapping
 ARTICLE_COLORS = {
     "der": "#4287f5",  # Blue
@@ -69,14 +97,56 @@ ARTICLE_COLORS = {
 # Utility Functions
 #
 
+@st.cache_resource
+def get_llm_cache():
+    """Response cache shared by every Gemini call in this process"""
+    return ResponseCache()
+
+@st.cache_resource(show_spinner=False)
+def get_request_engine(api_key):
+    """Worker pool, rate limiter and circuit breaker shared by every call made with an API key"""
+    return RequestEngine()
+
+@st.cache_resource
+def get_genai_configure_lock():
+    """Serializes ``genai.configure`` with binding its client, since the configuration is process-wide"""
+    return threading.Lock()
+
+@st.cache_resource(show_spinner=False)
+def get_gemini_model(api_key):
+    """Build the Gemini model for an API key once per process.
+    
+    The model is bound to its own client right away, so its connection is reused
+    across reruns and later configure calls for other keys don't affect it.
+    Sessions loading different keys at once take turns, so no model is bound
+    to a client configured for another key.
+    """
+    with get_genai_configure_lock():
+        if GEMINI_API_ENDPOINT:
+            genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": GEMINI_API_ENDPOINT})
+        else:
+            genai.configure(api_key=api_key)
+        model = genai.GenerativeModel('gemini-2.5-flash')
+        model._client = genai_client.get_default_generative_client()
+    # Cache hits skip the rate limiter; everything else is throttled and retried per key,
+    # and every attempt that reaches the API is timed
+    metered = MeteredModel(model, get_metrics())
+    return CachingModel(RateLimitedModel(metered, get_request_engine(api_key)), get_llm_cache())
+
+@st.cache_resource(show_spinner=False)
+def get_replay_model():
+    """Model that answers only from the recorded responses, built once per process"""
+    return CachingModel(genai.GenerativeModel('gemini-2.5-flash'), get_llm_cache())
+
 def configure_genai():
     """Configure the Gemini API"""
     try:
         # Check if we have an API key in session state
         if 'api_key' in st.session_state and st.session_state.api_key:
-            api_key = st.session_state.api_key
-            genai.configure(api_key=api_key)
-            return genai.GenerativeModel('gemini-2.5-flash')
+            return get_gemini_model(st.session_state.api_key)
+        elif get_llm_cache().mode == "replay":
+            # Recorded responses only, so no key or network is needed
+            return get_replay_model()
         else:
             # No API key found
             return None
@@ -85,58 +155,405 @@ def configure_genai():
         st.info("Please check your API key and try again.")
         return None
 
-def generate_new_word(model, category=None, level=None):
-    """Generate a new German vocabulary word using Gemini API"""
+def is_complete_word(word):
+    """Check that a generated word has every required key"""
+    return isinstance(word, dict) and all(key in word for key in WORD_FIELDS)
+
+@st.cache_resource
+def get_local_word_source():
+    """Bundled word lists shared by all sessions in this process"""
+    return LocalWordSource()
+
+def get_word_source(model):
+    """The session's word source: Gemini if a model is configured and selected, else the bundled lists"""
+    if model is not None and st.session_state.get("word_source", "gemini") == "gemini":
+        return GeminiWordSource(model)
+    return get_local_word_source()
+
+@st.cache_resource
+def get_word_pool():
+    """Generated words shared by all sessions in this process"""
+    return SharedWordPool()
+
+@st.cache_resource
+def get_latency_recorders():
+    """Process-wide latency windows for word requests, card loads, example streaming and answer reruns"""
+    return {
+        "word_request": LatencyRecorder(),
+        "card_hedged": LatencyRecorder(),
+        "card_single": LatencyRecorder(),
+        "examples_first_sentence": LatencyRecorder(),
+        "correct_answer_rerun": LatencyRecorder(),
+    }
+
+@st.cache_resource
+def get_metrics():
+    """Phase timings and Gemini call metrics shared by all sessions in this process"""
+    return Metrics()
+
+def timed_phase(phase):
+    """Decorator recording each call's duration in the ``phase_seconds`` histogram"""
+    def decorate(fn):
+        @wraps(fn)
+        def run(*args, **kwargs):
+            with get_metrics().time("phase_seconds", phase=phase):
+                return fn(*args, **kwargs)
+        return run
+    return decorate
+
+def timed_word_request(recorder, model, category, level, existing_words):
+    """Request a word from Gemini, recording the latency for the hedging deadline"""
+    start = perf_counter()
+    try:
+        return GeminiWordSource(model).new_word(category, level, existing_words=existing_words)
+    finally:
+        recorder.record(perf_counter() - start)
+
+def hedge_delay():
+    """Seconds to wait for a word before hedging: the recent request-latency percentile"""
+    recorder = get_latency_recorders()["word_request"]
+    if len(recorder) < HEDGE_MIN_SAMPLES:
+        return HEDGE_DEFAULT_DELAY
+    return recorder.percentile(HEDGE_PERCENTILE)
+
+def generate_new_word(model, category=None, level=None, notice_area=None):
+    """Generate a new German vocabulary word using Gemini API.
+    
+    Errors are queued for the ``notice_area`` fragment when called from a
+    callback, and shown directly when ``notice_area`` is None.
+    """
+    # Only the most recent matching words go into the prompt; the index catches the rest
+    vocabulary = st.session_state.vocabulary
+    existing_words = vocabulary.exclusion_list(category, level)
+    recorder = get_latency_recorders()["word_request"]
+    
+    try:
+        if st.session_state.get("hedging") and st.session_state.api_key:
+            # Race a second request if the first is slower than usual or returns nothing usable
+            new_word = get_request_engine(st.session_state.api_key).hedged(
+                partial(timed_word_request, recorder, model, category, level, existing_words),
+                lambda word: is_complete_word(word) and word["german"] not in vocabulary,
+                hedge_delay()
+            )
+        else:
+            new_word = timed_word_request(recorder, model, category, level, existing_words)
+        for _ in range(MAX_DUPLICATE_RETRIES):
+            if (not isinstance(new_word, dict) or "german" not in new_word
+                    or vocabulary.count_duplicate(new_word["german"], new_word.get("english")) is None):
+                break
+            # Re-request, explicitly excluding the duplicate we just got
+            existing_words = [new_word["german"]] + existing_words
+            new_word = timed_word_request(recorder, model, category, level, existing_words)
+        if is_complete_word(new_word):
+            get_word_pool().publish([new_word])
+        return new_word
+    except Exception as e:
+        if notice_area is None:
+            st.error(f"Error generating vocabulary: {str(e)}")
+        else:
+            show_notice(notice_area, "error", f"Error generating vocabulary: {str(e)}")
+        return None
+
+@st.cache_resource
+def get_database():
+    """SQLite database shared by all sessions, or None when persistence is disabled"""
+    return VocabularyDatabase(VOCAB_DB_PATH) if VOCAB_DB_PATH else None
+
+def get_deck_id():
+    """Identify this learner's deck through the URL so a refresh reloads it"""
+    deck_id = st.query_params.get("deck")
+    if not deck_id:
+        deck_id = uuid.uuid4().hex
+        st.query_params["deck"] = deck_id
+    return deck_id
+
+def persist_score():
+    """Persist the score counters if a database is configured"""
+    database = get_database()
+    if database is not None:
+        database.save_score(st.session_state.deck_id, st.session_state.score, st.session_state.total_attempts)
+
+def add_words_to_vocabulary(words, reject=DUPLICATE_REASONS):
+    """Add words to the vocabulary, the history store and the search index in one step.
+    
+    Words already in the vocabulary are skipped (duplicates whose reason is in
+    ``reject``); returns the words that were added.
+    """
+    added = st.session_state.vocabulary.extend(words, reject)
+    if added:
+        st.session_state.history.extend(added)
+        if "search_index" in st.session_state:
+            st.session_state.search_index.extend(added)
+        database = get_database()
+        if database is not None:
+            database.add_words(st.session_state.deck_id, added)
+    return added
+
+def request_word_batch(model, count, category=None, level=None, existing_words=(), letters=None):
+    """Ask Gemini for several words in a single call, raising on API errors.
+    
+    ``letters`` restricts the words' initial letters so parallel batches don't overlap.
+    Returns the valid, de-duplicated words, the total token count reported by the API
+    and the parser's rejections.
+    """
     category_prompt = f" in the category '{category}'" if category and category != "All" else ""
     level_prompt = f" for language level '{level}'" if level and level != "All" else ""
+    letters_prompt = (f"\nOnly use words whose first letter (ignoring any article) is one of: {', '.join(letters)}"
+                      if letters else "")
     
-    # Get all existing German words to avoid duplication
-    existing_words = set(word["german"] for word in st.session_state.vocabulary)
-    
-    prompt = WORD_GENERATION_PROMPT.format(
+    prompt = WORD_BATCH_GENERATION_PROMPT.format(
+        count=count,
         category_prompt=category_prompt,
         level_prompt=level_prompt,
-        existing_words=', '.join(existing_words) if existing_words else "none"
+        existing_words=', '.join(existing_words) if existing_words else "none",
+        letters_prompt=letters_prompt
     )
     
-    try:
-        response = model.generate_content(prompt)
+    response = generate_fresh(model, prompt)
+    parsed = parse_words(response.text, level)
+    seen = set()
+    words = []
+    for word in parsed.words:
+        key = word_key(word["german"])
+        if key not in seen:
+            seen.add(key)
+            words.append(word)
+    
+    usage = getattr(response, "usage_metadata", None)
+    tokens = getattr(usage, "total_token_count", 0) or 0
+    return words, tokens, parsed.rejections
+
+@timed_phase("generate_word_batch")
+def generate_word_batch():
+    """Generate batches of words in parallel and add them to the vocabulary in one step"""
+    model = st.session_state.model
+    count = max(1, min(int(st.session_state.batch_size), MAX_BATCH_SIZE))
+    parallel = max(1, min(int(st.session_state.batch_parallel), MAX_BATCH_PARALLEL))
+    category = st.session_state.filter_category if st.session_state.filter_category != "All" else None
+    level = st.session_state.level_filter if st.session_state.level_filter != "All" else None
+    existing_words = st.session_state.vocabulary.exclusion_list(category, level)
+    engine = get_request_engine(st.session_state.api_key)
+    
+    start = perf_counter()
+    # Parallel batches each cover a slice of the alphabet instead of all returning the same common words
+    letter_groups = [INITIAL_LETTERS[i::parallel] for i in range(parallel)] if parallel > 1 else [None]
+    futures = [engine.submit(request_word_batch, model, count, category, level, existing_words, letters)
+               for letters in letter_groups]
+    words, tokens, errors, rejected = [], 0, [], {}
+    for future in as_completed(futures):
         try:
-            # Try to parse as JSON directly
-            new_word = json.loads(response.text)
-            if isinstance(new_word, list) and len(new_word) > 0:
-                new_word = new_word[0]
-            if "level" not in new_word and level:
-                new_word["level"] = level
-            return new_word
-        except json.JSONDecodeError:
-            # If parsing fails, try to extract JSON content from response
-            json_match = re.search(r'{.*}', response.text, re.DOTALL)
-            if json_match:
-                try:
-                    new_word = json.loads(json_match.group(0))
-                    if "level" not in new_word and level:
-                        new_word["level"] = level
-                    return new_word
-                except:
-                    return None
-            return None
+            batch_words, batch_tokens, rejections = future.result()
+        except Exception as e:
+            errors.append(str(e))
+            continue
+        words.extend(batch_words)
+        tokens += batch_tokens
+        for rejection in rejections:
+            rejected[rejection.reason] = rejected.get(rejection.reason, 0) + 1
+            get_metrics().inc("parse_rejections_total", reason=rejection.reason)
+    elapsed = perf_counter() - start
+    
+    if errors and not words:
+        show_notice("sidebar", "error", f"Error generating vocabulary: {errors[0]}")
+        return
+    
+    get_word_pool().publish(words)
+    words = add_words_to_vocabulary(words)
+    
+    st.session_state.batch_stats = {
+        "requested": count * parallel,
+        "words": len(words),
+        "seconds": elapsed,
+        "words_per_second": len(words) / elapsed if elapsed > 0 else 0.0,
+        "tokens_per_word": tokens / len(words) if words else 0.0,
+        "rejected": rejected,
+    }
+    show_notice("sidebar", "success", f"Added {len(words)} of {count * parallel} requested words.")
+
+def produce_prefetch_word(model, category, level, existing_words):
+    """Generate a word for the prefetch buffer, discarding incomplete ones"""
+    new_word = GeminiWordSource(model).new_word(category, level, existing_words=existing_words)
+    return new_word if is_complete_word(new_word) else None
+
+def get_prefetcher(model):
+    """Get the session's word prefetcher, rebuilding it when the API key changes"""
+    prefetcher = st.session_state.get("prefetcher")
+    if prefetcher is None or st.session_state.get("prefetcher_api_key") != st.session_state.api_key:
+        if prefetcher is not None:
+            prefetcher.close()
+        prefetcher = WordPrefetcher(partial(produce_prefetch_word, model),
+                                    executor=get_request_engine(st.session_state.api_key))
+        st.session_state.prefetcher = prefetcher
+        st.session_state.prefetcher_api_key = st.session_state.api_key
+    return prefetcher
+
+def take_ready_word(model, category=None, level=None):
+    """Get an unseen word for the filters from the shared pool, then the prefetch buffer.
+    
+    Never waits on Gemini; returns None when no word is ready.
+    """
+    vocabulary = st.session_state.vocabulary
+    new_word = get_word_pool().draw(category, level, vocabulary)
+    if new_word is None:
+        # Prefetched words stay private to the session until they are actually used
+        new_word = get_prefetcher(model).pop(category, level, vocabulary, vocabulary.exclusion_list(category, level))
+        if new_word is not None:
+            get_word_pool().publish([new_word])
+    return new_word
+
+def take_new_word(model, category=None, level=None, notice_area="card"):
+    """Get a word for the filters from the session's word source.
+    
+    For Gemini, ready words come first, then a live call; if that fails too,
+    a bundled word keeps the learner going. Errors are queued for ``notice_area``.
+    """
+    vocabulary = st.session_state.vocabulary
+    source = get_word_source(model)
+    if source.instant:
+        return source.new_word(category, level, vocabulary)
+    new_word = take_ready_word(model, category, level)
+    if new_word is None:
+        new_word = generate_new_word(model, category, level, notice_area)
+    if new_word is None:
+        new_word = get_local_word_source().new_word(category, level, vocabulary)
+    return new_word
+
+def advance_after_correct_answer():
+    """Move to the next card without blocking the script thread.
+    
+    Uses a saved, pooled or prefetched word when one is ready; otherwise starts a
+    background request that the flashcard view polls for.
+    """
+    model = st.session_state.model
+    vocabulary = st.session_state.vocabulary
+    st.session_state.user_answer = ""
+    st.session_state.show_answer = False
+    
+    collection = st.session_state.saved_collections[st.session_state.current_collection]
+    if st.session_state.viewing_saved and collection:
+        st.session_state.current_word = collection.random_choice()
+        return
+    st.session_state.viewing_saved = False
+    
+    category = st.session_state.filter_category if st.session_state.filter_category != "All" else None
+    level = st.session_state.level_filter if st.session_state.level_filter != "All" else None
+    source = get_word_source(model)
+    if source.instant:
+        new_word = source.new_word(category, level, vocabulary)
+        if new_word is None:
+            # Every bundled word for the filters is known; repeat one instead
+            st.session_state.current_word = vocabulary.random_choice(category, level) or vocabulary.random_choice()
+            return
+    else:
+        new_word = take_ready_word(model, category, level)
+    if new_word is not None:
+        add_words_to_vocabulary([new_word])
+        st.session_state.current_word = new_word
+        return
+    
+    st.session_state.pending_word = get_request_engine(st.session_state.api_key).submit(
+        produce_prefetch_word, model, category, level, vocabulary.exclusion_list(category, level)
+    )
+    st.session_state.pending_filters = (category, level)
+
+def resolve_pending_word():
+    """Show the background-generated word once it has arrived"""
+    future = st.session_state.get("pending_word")
+    if future is None or not future.done():
+        return
+    st.session_state.pending_word = None
+    category, level = st.session_state.pending_filters
+    try:
+        new_word = future.result()
     except Exception as e:
         st.error(f"Error generating vocabulary: {str(e)}")
-        return None
+        new_word = None
+    
+    if new_word is not None and st.session_state.vocabulary.count_duplicate(new_word["german"], new_word.get("english")) is None:
+        get_word_pool().publish([new_word])
+        add_words_to_vocabulary([new_word])
+        st.session_state.current_word = new_word
+    else:
+        # Fall back to a word we already have rather than making the learner wait again
+        st.session_state.current_word = (st.session_state.vocabulary.random_choice(category, level)
+                                         or st.session_state.vocabulary.random_choice())
+
+def request_app_rerun():
+    """Ask for a full-app rerun after a fragment widget changes state shown outside the fragment"""
+    st.session_state.rerun_app = True
+
+def app_scoped(callback):
+    """Wrap a fragment widget callback so its effects reach the rest of the page"""
+    def run(*args, **kwargs):
+        callback(*args, **kwargs)
+        request_app_rerun()
+    return run
+
+def show_notice(area, kind, message):
+    """Queue a status message from a widget callback for the ``card`` or ``sidebar`` fragment.
+    
+    Elements written by a callback during a fragment rerun land at the top of the
+    page, and are lost entirely when the callback triggers a full-app rerun.
+    ``kind`` is the name of the Streamlit element, e.g. ``success`` or ``error``.
+    """
+    st.session_state.setdefault("notices", {}).setdefault(area, []).append((kind, message))
 
-def generate_examples(word, model):
-    """Generate example sentences using the word"""
+def render_notices(area):
+    """Show and clear the status messages queued for a fragment"""
+    for kind, message in st.session_state.get("notices", {}).pop(area, []):
+        getattr(st, kind)(message)
+
+def rerun_app_if_requested():
+    """Turn a fragment rerun into a full-app rerun when a callback asked for one"""
+    if st.session_state.pop("rerun_app", False):
+        st.rerun()
+
+@st.fragment(run_every=NEXT_WORD_POLL_SECONDS)
+def await_pending_word():
+    """Poll for the background-generated word without rerunning the whole app"""
+    future = st.session_state.get("pending_word")
+    if future is None or future.done():
+        st.rerun()
+    st.info("Loading the next word...")
+
+@st.cache_resource
+def get_example_cache():
+    """Example sentence cache shared by all sessions in this process"""
+    return ExampleCache()
+
+def stream_examples(word, model):
+    """Stream example sentences for the word, yielding the complete lines received so far.
+    
+    Cached examples are yielded at once, even without a model; streamed text is cached
+    when it completes.
+    """
+    cache = get_example_cache()
+    key = (word['german'], word.get('level', 'A1'), EXAMPLE_SENTENCES_PROMPT_VERSION)
+    examples = cache.get(key)
+    if examples is not None:
+        yield examples
+        return
+    if model is None:
+        yield "Example sentences need a Gemini API key."
+        return
+    
     prompt = EXAMPLE_SENTENCES_PROMPT.format(
         german=word['german'],
         level=word.get('level', 'A1')
     )
     
     try:
-        response = model.generate_content(prompt)
-        return response.text
+        text = ""
+        for chunk in model.generate_content(prompt, stream=True):
+            text += chunk.text
+            # Only show whole lines so a sentence never appears half-written
+            complete = text[:text.rfind("\n") + 1].strip()
+            if complete:
+                yield complete
+        cache.put(key, text)
+        yield text.strip()
     except Exception as e:
-        return f"Error generating examples: {str(e)}"
+        yield f"Error generating examples: {str(e)}"
 
 def get_word_class(word):
     """Determine the CSS class for a word based on its article"""
@@ -161,9 +578,13 @@ def get_article_class(article):
         return "das-text"
     return ""
 
-def next_word():
-    """Get the next word to display"""
+@timed_phase("next_word")
+def next_word(notice_area="card"):
+    """Get the next word to display; errors are queued for the ``notice_area`` fragment"""
     model = st.session_state.model
+    start = perf_counter()
+    # A background word from a previous correct answer is no longer wanted
+    st.session_state.pending_word = None
     
     with st.spinner("Generating a new word..."):
         # Reset the answer field
@@ -173,84 +594,65 @@ def next_word():
             # Get word from saved collection
             collection = st.session_state.saved_collections[st.session_state.current_collection]
             if collection:
-                st.session_state.current_word = random.choice(collection)
+                st.session_state.current_word = collection.random_choice()
             else:
                 # If collection is empty, generate a new word
                 st.session_state.viewing_saved = False
                 category = st.session_state.filter_category if st.session_state.filter_category != "All" else None
                 level = st.session_state.level_filter if st.session_state.level_filter != "All" else None
-                new_word = generate_new_word(model, category, level)
+                new_word = take_new_word(model, category, level, notice_area)
                 
-                if new_word and all(key in new_word for key in ["german", "english", "article", "category", "level"]):
-                    st.session_state.vocabulary.append(new_word)
+                if is_complete_word(new_word):
+                    add_words_to_vocabulary([new_word])
                     st.session_state.current_word = new_word
-                    
-                    # Add to history dataframe
-                    st.session_state.history_df = pd.concat([
-                        st.session_state.history_df, 
-                        pd.DataFrame([new_word])
-                    ], ignore_index=True)
         else:
             # Generate a completely new word
             category = st.session_state.filter_category if st.session_state.filter_category != "All" else None
             level = st.session_state.level_filter if st.session_state.level_filter != "All" else None
-            new_word = generate_new_word(model, category, level)
+            new_word = take_new_word(model, category, level, notice_area)
             
-            if new_word and all(key in new_word for key in ["german", "english", "article", "category", "level"]):
+            if is_complete_word(new_word):
                 # Check if word already exists
-                if not any(w["german"] == new_word["german"] for w in st.session_state.vocabulary):
-                    st.session_state.vocabulary.append(new_word)
+                if new_word["german"] not in st.session_state.vocabulary:
+                    add_words_to_vocabulary([new_word])
                     st.session_state.current_word = new_word
-                    
-                    # Add to history dataframe
-                    st.session_state.history_df = pd.concat([
-                        st.session_state.history_df, 
-                        pd.DataFrame([new_word])
-                    ], ignore_index=True)
                 else:
                     # If word already exists, pick a random one that matches the filters
-                    filtered_vocab = [w for w in st.session_state.vocabulary 
-                                     if (category is None or w["category"] == category) and
-                                        (level is None or w.get("level") == level)]
-                    if filtered_vocab:
-                        st.session_state.current_word = random.choice(filtered_vocab)
+                    filtered_word = st.session_state.vocabulary.random_choice(category, level)
+                    if filtered_word:
+                        st.session_state.current_word = filtered_word
                     else:
                         # If no matches, try to get a new word again
                         if st.session_state.vocabulary:
-                            st.session_state.current_word = random.choice(st.session_state.vocabulary)
+                            st.session_state.current_word = st.session_state.vocabulary.random_choice()
                         else:
                             # If vocabulary is still empty, try once more without filters
-                            new_word = generate_new_word(model, None, None)
+                            new_word = take_new_word(model, None, None, notice_area)
                             if new_word:
-                                st.session_state.vocabulary.append(new_word)
+                                add_words_to_vocabulary([new_word])
                                 st.session_state.current_word = new_word
-                                st.session_state.history_df = pd.concat([
-                                    st.session_state.history_df, 
-                                    pd.DataFrame([new_word])
-                                ], ignore_index=True)
             else:
                 # If generation failed, pick a random one that matches the filters
-                filtered_vocab = [w for w in st.session_state.vocabulary 
-                                 if (category is None or w["category"] == category) and
-                                    (level is None or w.get("level") == level)]
-                if filtered_vocab:
-                    st.session_state.current_word = random.choice(filtered_vocab)
+                filtered_word = st.session_state.vocabulary.random_choice(category, level)
+                if filtered_word:
+                    st.session_state.current_word = filtered_word
                 elif st.session_state.vocabulary:
-                    st.session_state.current_word = random.choice(st.session_state.vocabulary)
+                    st.session_state.current_word = st.session_state.vocabulary.random_choice()
                 else:
                     # If vocabulary is still empty, try once more without filters
-                    new_word = generate_new_word(model, None, None)
+                    new_word = take_new_word(model, None, None, notice_area)
                     if new_word:
-                        st.session_state.vocabulary.append(new_word)
+                        add_words_to_vocabulary([new_word])
                         st.session_state.current_word = new_word
-                        st.session_state.history_df = pd.concat([
-                            st.session_state.history_df, 
-                            pd.DataFrame([new_word])
-                        ], ignore_index=True)
+    
+    # Card latency, split by hedging mode so the extra API cost can be judged
+    mode = "card_hedged" if st.session_state.get("hedging") else "card_single"
+    get_latency_recorders()[mode].record(perf_counter() - start)
     
     st.session_state.show_answer = False
     st.session_state.feedback = None
 
+@timed_phase("check_answer")
 def check_answer():
     """Check if the user's answer is correct"""
     user_answer = st.session_state.user_answer.strip().lower()
@@ -260,12 +662,14 @@ def check_answer():
     
     if user_answer == correct_answer:
         st.session_state.score += 1
+        persist_score()
+        # Show the success message on the next card right away
+        st.session_state.answer_checked_at = perf_counter()
+        advance_after_correct_answer()
         st.session_state.feedback = "correct"
-        # Wait briefly before showing a new word
-        sleep(0.8)
-        next_word()
     else:
         st.session_state.feedback = "incorrect"
+        persist_score()
 
 def reveal_answer():
     """Show the answer to the current word"""
@@ -282,22 +686,51 @@ def add_vocabulary():
     }
     
     if new_word["german"] and new_word["english"]:
-        st.session_state.vocabulary.append(new_word)
-        # Also add to history dataframe
-        st.session_state.history_df = pd.concat([
-            st.session_state.history_df, 
-            pd.DataFrame([new_word])
-        ], ignore_index=True)
+        # Spelling variants and near matches may be distinct words ("schon"/"schön"); the learner decides
+        if not add_words_to_vocabulary([new_word], reject=("exact",)):
+            show_notice("sidebar", "info", "This word is already in your vocabulary.")
+            return
         
         st.session_state.new_german = ""
         st.session_state.new_english = ""
         st.session_state.new_article = ""
         st.session_state.new_category = ""
-        st.success("New vocabulary added!")
+        show_notice("sidebar", "success", "New vocabulary added!")
+
+def export_version(scope):
+    """Version of the words an export covers: the history version, or the size of an append-only collection"""
+    if scope is None:
+        return ("all", st.session_state.history.version)
+    return ("collection", scope, len(st.session_state.saved_collections.get(scope, [])))
+
+@timed_phase("prepare_export")
+def prepare_export():
+    """Encode the selected words in the selected format, cached until they change"""
+    export_format = st.session_state.export_format
+    scope = st.session_state.export_scope
+    history = st.session_state.history
+    if scope is None:
+        rows = history.rows()
+    else:
+        rows = (tuple(word.get(column, "") for column in history.columns)
+                for word in st.session_state.saved_collections.get(scope, []))
+    
+    start = perf_counter()
+    data = export_bytes(export_format, rows, history.columns)
+    st.session_state.export = {
+        "format": export_format,
+        "version": export_version(scope),
+        "data": data,
+        "seconds": perf_counter() - start,
+    }
 
-def export_vocab():
-    """Export vocabulary to CSV"""
-    return st.session_state.history_df.to_csv(index=False).encode('utf-8')
+def current_export():
+    """The prepared export if it matches the selected format and the words are unchanged, else None"""
+    export = st.session_state.get("export")
+    if (export is None or export["format"] != st.session_state.get("export_format")
+            or export["version"] != export_version(st.session_state.get("export_scope"))):
+        return None
+    return export
 
 def save_word():
     """Save current word to the selected collection"""
@@ -307,20 +740,24 @@ def save_word():
     # Add to collection if not already there
     if word not in st.session_state.saved_collections[collection]:
         st.session_state.saved_collections[collection].append(word)
-        st.success(f"Word saved to '{collection}' collection!")
+        database = get_database()
+        if database is not None:
+            database.add_collection_word(st.session_state.deck_id, collection, word)
+        show_notice("card", "success", f"Word saved to '{collection}' collection!")
     else:
-        st.info("This word is already in this collection.")
+        show_notice("card", "info", "This word is already in this collection.")
 
 def reset_score():
     """Reset the score counter"""
     st.session_state.score = 0
     st.session_state.total_attempts = 0
+    persist_score()
 
 def set_category_filter():
     """Apply the selected category filter"""
     st.session_state.filter_category = st.session_state.category_filter
     st.session_state.viewing_saved = False
-    next_word()
+    next_word("sidebar")
 
 def toggle_vocab_table():
     """Toggle the vocabulary table view"""
@@ -333,10 +770,10 @@ def view_saved_words():
     
     # If collection is empty, show warning
     if not st.session_state.saved_collections[collection]:
-        st.warning(f"Collection '{collection}' is empty. Please save some words first.")
+        show_notice("sidebar", "warning", f"Collection '{collection}' is empty. Please save some words first.")
         st.session_state.viewing_saved = False
     else:
-        st.session_state.current_word = random.choice(st.session_state.saved_collections[collection])
+        st.session_state.current_word = st.session_state.saved_collections[collection].random_choice()
         st.session_state.show_answer = False
         st.session_state.feedback = None
         st.session_state.user_answer = ""
@@ -344,20 +781,23 @@ def view_saved_words():
 def view_all_words():
     """Switch to all words view"""
     st.session_state.viewing_saved = False
-    next_word()
+    next_word("sidebar")
 
 def create_collection():
     """Create a new collection of words"""
     name = st.session_state.collection_name.strip()
     if name and name not in st.session_state.saved_collections:
-        st.session_state.saved_collections[name] = []
+        st.session_state.saved_collections[name] = WordCollection()
+        database = get_database()
+        if database is not None:
+            database.add_collection(st.session_state.deck_id, name)
         st.session_state.current_collection = name
         st.session_state.collection_name = ""
-        st.success(f"Created new collection: {name}")
+        show_notice("sidebar", "success", f"Created new collection: {name}")
     elif name in st.session_state.saved_collections:
-        st.error("Collection with this name already exists.")
+        show_notice("sidebar", "error", "Collection with this name already exists.")
     else:
-        st.error("Please enter a collection name.")
+        show_notice("sidebar", "error", "Please enter a collection name.")
 
 #
 # CSS Styling
@@ -465,11 +905,84 @@ def apply_styles():
 # UI Components 
 #
 
-def render_flashcard_view(model):
-    """Render the flashcard view"""
+def render_score(score_box):
+    """Draw the score metrics into the sidebar placeholder"""
+    accuracy = (st.session_state.score / st.session_state.total_attempts * 100) if st.session_state.total_attempts > 0 else 0
+    with score_box.container():
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Score", f"{st.session_state.score}/{st.session_state.total_attempts}")
+        with col2:
+            st.metric("Accuracy", f"{accuracy:.1f}%")
+
+def render_metrics_panel():
+    """Show the process-wide histograms and counters, with dumps for dashboards"""
+    metrics = get_metrics()
+    with st.expander("Metrics"):
+        rows = []
+        for series in metrics.snapshot():
+            labels = ", ".join(f"{name}={value}" for name, value in series["labels"].items())
+            if series["type"] == "counter":
+                rows.append({"metric": series["name"], "labels": labels, "count": series["value"]})
+                continue
+            histogram = metrics.histogram(series["name"], **series["labels"])
+            # Latencies are shown in milliseconds, sizes in characters
+            scale = 1000 if series["name"].endswith("_seconds") else 1
+            rows.append({
+                "metric": series["name"],
+                "labels": labels,
+                "count": histogram.count,
+                "mean": histogram.sum / histogram.count * scale,
+                "p50": histogram.quantile(0.5) * scale,
+                "p99": histogram.quantile(0.99) * scale,
+            })
+        if rows:
+            st.dataframe(pd.DataFrame(rows), hide_index=True)
+        else:
+            st.caption("No metrics recorded yet.")
+        col_a, col_b = st.columns(2)
+        with col_a:
+            st.download_button("JSON lines", metrics.to_jsonl(), file_name="vocab_metrics.jsonl",
+                               mime="application/x-ndjson", key="metrics_jsonl_button")
+        with col_b:
+            st.download_button("Prometheus", metrics.to_prometheus(), file_name="vocab_metrics.prom",
+                               mime="text/plain", key="metrics_prometheus_button")
+
+@timed_phase("keep_prefetch_warm")
+def keep_prefetch_warm(model):
+    """Swap in a background-generated word if one has arrived and refill the prefetch buffer"""
+    resolve_pending_word()
+    if get_word_source(model).instant:
+        return
+    category = st.session_state.filter_category if st.session_state.filter_category != "All" else None
+    level = st.session_state.level_filter if st.session_state.level_filter != "All" else None
+    get_prefetcher(model).fill(category, level, st.session_state.vocabulary.exclusion_list(category, level))
+
+@st.fragment
+@timed_phase("flashcard_view")
+def render_flashcard_view(model, score_box):
+    """Render the flashcard view.
+    
+    Runs as a fragment: answering, revealing and skipping words rerun only the card.
+    ``score_box`` is the sidebar placeholder for the score, which changes with every answer.
+    """
+    rerun_app_if_requested()
+    cpu_start = thread_time()
+    render_notices("card")
+    keep_prefetch_warm(model)
+    if score_box is not None:
+        render_score(score_box)
+    
     col1, col2, col3 = st.columns([1, 3, 1])
     
     with col2:
+        # The next word is still being generated after a correct answer
+        if st.session_state.get("pending_word") is not None:
+            st.success("Correct! 🎉")
+            await_pending_word()
+            st.session_state.card_cpu_seconds = thread_time() - cpu_start
+            return
+        
         # Create a card-like container
         card = st.container()
         with card:
@@ -489,6 +1002,8 @@ def render_flashcard_view(model):
             # Show feedback
             if st.session_state.feedback == "correct":
                 st.success("Correct! 🎉")
+                # The card has already moved on; greet the new word once, not on every later rerun
+                st.session_state.feedback = None
             elif st.session_state.feedback == "incorrect":
                 st.error("Try again! 😕")
                 
@@ -499,7 +1014,7 @@ def render_flashcard_view(model):
             with col_b:
                 st.button("Next Word", on_click=next_word)
             with col_c:
-                st.button("Save Word", on_click=save_word)
+                st.button("Save Word", on_click=app_scoped(save_word))
             
             # Show answer and examples if requested
             if st.session_state.show_answer:
@@ -510,38 +1025,146 @@ def render_flashcard_view(model):
                 </div>
                 """, unsafe_allow_html=True)
                 
-                with st.spinner("Generating example sentences..."):
-                    examples = generate_examples(st.session_state.current_word, model)
-                    st.markdown(f"""
+                # Render sentences as they stream in instead of waiting for the whole response
+                examples_box = st.empty()
+                examples_box.caption("Generating example sentences...")
+                start = perf_counter()
+                first_sentence_seconds = None
+                for examples in stream_examples(st.session_state.current_word, model):
+                    if first_sentence_seconds is None:
+                        first_sentence_seconds = perf_counter() - start
+                    examples_box.markdown(f"""
                     <div style="background-color: #252526; padding: 15px; border-radius: 5px; margin-top: 15px; border: 1px solid #3E3E42;">
                         <h3 style="color: #E0E0E0;">Example Sentences</h3>
                         <pre style="background-color: #2D2D30; padding: 10px; border-radius: 5px; color: #E0E0E0; white-space: pre-wrap;">{examples}</pre>
                     </div>
                     """, unsafe_allow_html=True)
+                
+                if first_sentence_seconds is not None:
+                    get_latency_recorders()["examples_first_sentence"].record(first_sentence_seconds)
+                    get_metrics().observe("phase_seconds", perf_counter() - start, phase="examples")
+                    if st.session_state.get("debug_mode"):
+                        st.caption(f"Time to first example sentence: {first_sentence_seconds * 1000:.0f} ms "
+                                   f"(total {(perf_counter() - start) * 1000:.0f} ms)")
+    
+    # Time from submitting a correct answer until the next card is on screen
+    answer_checked_at = st.session_state.pop("answer_checked_at", None)
+    if answer_checked_at is not None:
+        get_latency_recorders()["correct_answer_rerun"].record(perf_counter() - answer_checked_at)
+    
+    st.session_state.card_cpu_seconds = thread_time() - cpu_start
+    if st.session_state.get("debug_mode"):
+        st.caption(f"Server CPU: card {st.session_state.card_cpu_seconds * 1000:.1f} ms, "
+                   f"last full rerun {st.session_state.get('app_cpu_seconds', 0) * 1000:.1f} ms")
+
+def highlight_article(value):
+    """Color an article cell like the flashcards"""
+    return f"color: {ARTICLE_COLORS[value]}" if value in ("der", "die", "das") else ""
+
+def reset_table_page():
+    """Go back to the first page when the table filters or sorting change"""
+    st.session_state.table_page = 1
+
+def get_search_index():
+    """The session's search index, built on first use and then updated as words are added"""
+    if "search_index" not in st.session_state:
+        st.session_state.search_index = SearchIndex(st.session_state.vocabulary)
+    return st.session_state.search_index
+
+def get_table_positions(df, version, filters):
+    """Row positions matching the table filters in display order, cached until the filters or words change.
+    
+    With a search query, rows are limited to the search results, in relevance order unless sorted.
+    """
+    cached = st.session_state.get("table_positions")
+    if cached is not None and cached[0] == (version, filters):
+        return cached[1]
+    
+    query, category, level, article, sort_by, descending = filters
+    view = df.take(get_search_index().search(query)) if query else df
+    mask = pd.Series(True, index=view.index)
+    if category != "All":
+        mask &= view["category"] == category
+    if level != "All":
+        mask &= view["level"] == level
+    if article != "All":
+        mask &= view["article"] == ("" if article == "none" else article)
+    view = view[mask]
+    if sort_by != "added":
+        view = view.sort_values(sort_by, ascending=not descending, kind="stable")
+    elif descending:
+        view = view.iloc[::-1]
+    positions = view.index.to_numpy()
+    st.session_state.table_positions = ((version, filters), positions)
+    return positions
+
+def get_styled_page(df, positions, version, filters, page, page_size):
+    """Styled rows of one table page; styling only runs for the visible rows and is cached per page"""
+    pages = st.session_state.setdefault("table_pages", OrderedDict())
+    key = (version, filters, page, page_size)
+    if key in pages:
+        pages.move_to_end(key)
+        return pages[key]
+    
+    start = (page - 1) * page_size
+    page_df = df.take(positions[start:start + page_size]).reset_index(drop=True)
+    page_df.index += start + 1
+    styled = page_df.style.map(highlight_article, subset=["article"])
+    pages[key] = styled
+    while len(pages) > TABLE_PAGE_CACHE_SIZE:
+        pages.popitem(last=False)
+    return styled
 
+@timed_phase("vocabulary_table")
 def render_vocabulary_table():
-    """Render the vocabulary table view using streamlit's native dataframe"""
+    """Render one page of the filtered, sorted vocabulary using streamlit's native dataframe"""
     st.header("Complete Vocabulary List")
     
-    # Create a dataframe for display
-    df = st.session_state.history_df.copy()
+    # Cached dataframe for display (read-only, styling does not modify it)
+    history = st.session_state.history
+    df = history.to_dataframe()
     
-    # Add styling for the articles if needed
-    def highlight_articles(val):
-        if val == 'der':
-            return 'color: #4287f5'  # Blue
-        elif val == 'die':
-            return 'color: #f542a7'  # Pink
-        elif val == 'das':
-            return 'color: #42f54b'  # Green
-        return ''
+    # Filtering and sorting happen here; only the visible page is sent to the browser
+    query = st.text_input("Search German or English:", key="table_search", on_change=reset_table_page,
+                          placeholder="e.g. Hund, dog, Schmeterling").strip()
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        category = st.selectbox("Category:", ["All", *st.session_state.vocabulary.categories()],
+                                key="table_category", on_change=reset_table_page)
+    with col2:
+        level = st.selectbox("Level:", ["All", *CEFR_LEVELS], key="table_level", on_change=reset_table_page)
+    with col3:
+        article = st.selectbox("Article:", ["All", "der", "die", "das", "none"], key="table_article",
+                               on_change=reset_table_page)
+    with col4:
+        sort_by = st.selectbox("Sort by:", ["added", *history.columns], key="table_sort",
+                               on_change=reset_table_page,
+                               format_func=lambda column: ("relevance" if query else "added")
+                               if column == "added" else column)
+    with col5:
+        page_size = st.selectbox("Rows per page:", TABLE_PAGE_SIZES, key="table_page_size",
+                                 on_change=reset_table_page)
+    descending = st.checkbox("Descending", key="table_descending", on_change=reset_table_page)
+    
+    filters = (query, category, level, article, sort_by, descending)
+    positions = get_table_positions(df, history.version, filters)
+    page_count = max(1, -(-len(positions) // page_size))
+    if st.session_state.get("table_page", 1) > page_count:
+        st.session_state.table_page = page_count
+    page = st.number_input(f"Page (of {page_count}):", min_value=1, max_value=page_count, step=1,
+                           key="table_page")
     
-    # Apply styling (optional)
-    styled_df = df.style.applymap(highlight_articles, subset=['article'])
+    start = (page - 1) * page_size
+    if len(positions):
+        matching = "search results" if query else "matching words"
+        st.caption(f"Showing {start + 1}-{min(start + page_size, len(positions))} "
+                   f"of {len(positions)} {matching} ({len(df)} total)")
+    else:
+        st.caption(f"No words match these filters ({len(df)} total)")
     
-    # Display the dataframe with fixed height and width
+    # Display the page with fixed height and width
     st.dataframe(
-        styled_df,
+        get_styled_page(df, positions, history.version, filters, page, page_size),
         use_container_width=True,
         height=400  # Adjust height as needed
     )
@@ -552,7 +1175,10 @@ def render_vocabulary_table():
         st.rerun()
 
 def render_sidebar(model):
-    """Render the sidebar with statistics and settings"""
+    """Render the sidebar: API configuration, then the statistics and settings fragment.
+    
+    Returns the placeholder the score is drawn into.
+    """
     with st.sidebar:
         # API Key Configuration Section - Always at the top
         st.header("API Configuration")
@@ -561,7 +1187,8 @@ def render_sidebar(model):
         if 'api_key' in st.session_state and st.session_state.api_key:
             st.success("Gemini API key is configured")
             if st.button("Change API Key"):
-                # Reset the API key
+                # Drop the cached client for the old key and reset it
+                get_gemini_model.clear(st.session_state.api_key)
                 st.session_state.api_key = ""
                 st.rerun()
         else:
@@ -595,111 +1222,218 @@ def render_sidebar(model):
             For more details, visit [Google AI documentation](https://ai.google.dev/tutorials/setup).
             """)
         
-        # Only show the rest of the sidebar if API key is configured
+        # Without a key, words come from the bundled lists
         if not model:
-            st.warning("Please provide a valid API key to use the app")
-            return
+            st.warning("Add an API key for AI-generated words and example sentences")
         
         # Add a separator between API configuration and other sections
         st.divider()
         
-        # Rest of the sidebar remains the same
+        # The score is redrawn by the flashcard fragment after every answer
         st.header("Statistics")
-        accuracy = (st.session_state.score / st.session_state.total_attempts * 100) if st.session_state.total_attempts > 0 else 0
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric("Score", f"{st.session_state.score}/{st.session_state.total_attempts}")
-        with col2:
-            st.metric("Accuracy", f"{accuracy:.1f}%")
-        
-        if st.session_state.total_attempts > 0:
-            st.button("Reset Score", on_click=reset_score, key="reset_score_button")
-        
-        st.header("Settings")
-        
-        # Category filter
-        categories = ["All"] + list(set(word["category"] for word in st.session_state.vocabulary))
-        st.selectbox("Filter by category:", categories, key="category_filter", 
-                     index=categories.index(st.session_state.filter_category) if st.session_state.filter_category in categories else 0)
-        
-        levels = ["All", "A1", "A2", "B1", "B2", "C1", "C2"]
-        st.selectbox("Filter by level:", levels, key="level_filter", 
-                    index=levels.index(st.session_state.level_filter) if st.session_state.level_filter in levels else 0)
-        
-        # Single Apply Filter button for both category and level filters
-        st.button("Apply Filter", on_click=set_category_filter, key="apply_filter_button")
-        
-        # Saved Collections section
-        st.header("Saved Collections")
-        
-        # Create new collection
-        st.text_input("New Collection Name:", key="collection_name")
-        st.button("Create Collection", on_click=create_collection, key="create_collection_button")
-        
-        # Select current collection
-        collections = list(st.session_state.saved_collections.keys())
-        st.selectbox("Select Collection:", collections, key="current_collection", 
-                    index=collections.index(st.session_state.current_collection) if st.session_state.current_collection in collections else 0)
-        
-        # View buttons
-        col_a, col_b = st.columns(2)
-        with col_a:
-            st.button("View Saved", on_click=view_saved_words, 
-                     disabled=len(st.session_state.saved_collections[st.session_state.current_collection]) == 0,
-                     key="view_saved_button")
-        with col_b:
-            st.button("View All", on_click=view_all_words, disabled=not st.session_state.viewing_saved,
-                     key="view_all_button")
-        
-        # Display mode indicator
-        if st.session_state.viewing_saved:
-            st.info(f"Viewing saved words from '{st.session_state.current_collection}'")
-        
-        # Manually add vocabulary
-        st.header("Add Vocabulary Manually")
-        st.text_input("German Word:", key="new_german")
-        st.text_input("English Translation:", key="new_english")
-        st.text_input("Article (der/die/das):", key="new_article")
-        st.text_input("Category:", key="new_category")
-        levels = ["A1", "A2", "B1", "B2", "C1", "C2"]
-        st.selectbox("Level:", levels, key="new_level")
-        st.button("Add Word", on_click=add_vocabulary, key="add_word_button")
-        
-        # Button to view all vocabulary as a table
-        st.button("View All Vocabulary Table", on_click=toggle_vocab_table, key="view_vocab_table_button")
-        
-        # Export vocabulary
+        score_box = st.empty()
+        render_score(score_box)
+        render_sidebar_panel(model)
+    return score_box
+
+@st.fragment
+@timed_phase("sidebar_panel")
+def render_sidebar_panel(model):
+    """Render the sidebar statistics, settings, collections and export.
+    
+    Runs as a fragment so its widgets don't rerun the card; callbacks that change
+    the card or the main view request a full-app rerun.
+    """
+    rerun_app_if_requested()
+    render_notices("sidebar")
+    if st.session_state.total_attempts > 0:
+        st.button("Reset Score", on_click=app_scoped(reset_score), key="reset_score_button")
+    
+    # Prefetch buffer statistics
+    if not get_word_source(model).instant:
+        prefetch_stats = get_prefetcher(model).stats()
+        st.caption(f"Prefetched words ready: {prefetch_stats['buffered']} "
+                   f"(hits: {prefetch_stats['hits']}, misses: {prefetch_stats['misses']}, "
+                   f"stale dropped: {prefetch_stats['stale']})")
+    pool_stats = get_word_pool().stats()
+    st.caption(f"Shared word pool: {pool_stats['size']} words "
+               f"(hits: {pool_stats['hits']}, misses: {pool_stats['misses']})")
+    table_stats = shared_table.stats()
+    st.caption(f"Shared word table: {table_stats['words']} words held by sessions "
+               f"({table_stats['ids']} IDs issued)")
+    rejected = st.session_state.vocabulary.rejected
+    if rejected:
+        st.caption(f"Duplicate words rejected: {sum(rejected.values())} ("
+                   f"{rejected.get('exact', 0)} exact, {rejected.get('variant', 0)} spelling/article variants, "
+                   f"{rejected.get('near', 0)} near matches)")
+    st.caption(f"Gemini client setup this rerun: {st.session_state.client_setup_seconds * 1000:.2f} ms")
+    if st.session_state.api_key:
+        engine_stats = get_request_engine(st.session_state.api_key).stats()
+        st.caption(f"Gemini requests: {engine_stats['calls']} calls, {engine_stats['retries']} retries, "
+                   f"{engine_stats['failures']} transient failures, {engine_stats['hedges']} hedges "
+                   f"({engine_stats['hedge_wins']} won), {engine_stats['tokens']:.0f} tokens "
+                   f"available, circuit {engine_stats['breaker']}")
+    for mode, label in (("card_single", "without hedging"), ("card_hedged", "with hedging")):
+        card_latency = get_latency_recorders()[mode].summary()
+        if card_latency["count"]:
+            st.caption(f"Card latency {label} ({card_latency['count']} cards): "
+                       f"p50 {card_latency['p50'] * 1000:.0f} ms, p95 {card_latency['p95'] * 1000:.0f} ms, "
+                       f"p99 {card_latency['p99'] * 1000:.0f} ms")
+    answer_latency = get_latency_recorders()["correct_answer_rerun"].summary()
+    if answer_latency["count"] and st.session_state.get("debug_mode"):
+        st.caption(f"Correct answer to next card ({answer_latency['count']} answers): "
+                   f"p50 {answer_latency['p50'] * 1000:.0f} ms, p95 {answer_latency['p95'] * 1000:.0f} ms")
+    llm_stats = get_llm_cache().stats()
+    st.caption(f"Gemini response cache ({llm_stats['mode']}): {llm_stats['size']} entries "
+               f"(hits: {llm_stats['hits']}, misses: {llm_stats['misses']}, evicted: {llm_stats['evictions']})")
+    example_stats = get_example_cache().stats()
+    st.caption(f"Example cache: {example_stats['size']} entries, "
+               f"{example_stats['hit_rate']:.0%} hit rate "
+               f"({example_stats['hits']} memory, {example_stats['disk_hits']} disk, "
+               f"{example_stats['misses']} misses, {example_stats['evictions']} evicted)")
+    if st.session_state.get("debug_mode"):
+        render_metrics_panel()
+    
+    st.header("Settings")
+    
+    # Word source; the bundled lists are the only one without a model
+    if model is not None:
+        st.radio("Word source:", list(WORD_SOURCE_LABELS), key="word_source", format_func=WORD_SOURCE_LABELS.get,
+                 horizontal=True, help="Bundled word lists are instant and need no API calls; "
+                                       "Gemini generates new words beyond them.")
+    else:
+        st.caption(f"Word source: {WORD_SOURCE_LABELS['local']} ({len(get_local_word_source())} words)")
+    
+    # Category filter; the bundled lists' categories can be picked before any of their words was seen
+    categories = ["All"] + st.session_state.vocabulary.categories()
+    if get_word_source(model).instant:
+        categories += [category for category in get_local_word_source().categories() if category not in categories]
+    st.selectbox("Filter by category:", categories, key="category_filter", 
+                 index=categories.index(st.session_state.filter_category) if st.session_state.filter_category in categories else 0)
+    
+    levels = ["All", *CEFR_LEVELS]
+    st.selectbox("Filter by level:", levels, key="level_filter", 
+                index=levels.index(st.session_state.level_filter) if st.session_state.level_filter in levels else 0)
+    
+    # Single Apply Filter button for both category and level filters
+    st.button("Apply Filter", on_click=app_scoped(set_category_filter), key="apply_filter_button")
+    
+    st.checkbox("Debug mode", key="debug_mode", on_change=request_app_rerun,
+                help="Show timing details for the current card.")
+    st.checkbox("Hedge slow word requests", key="hedging",
+                help="Send a second request when a new word takes longer than usual. "
+                     "Cuts waiting time at the cost of extra API calls.")
+    
+    # Saved Collections section
+    st.header("Saved Collections")
+    
+    # Create new collection
+    st.text_input("New Collection Name:", key="collection_name")
+    st.button("Create Collection", on_click=create_collection, key="create_collection_button")
+    
+    # Select current collection
+    collections = list(st.session_state.saved_collections.keys())
+    st.selectbox("Select Collection:", collections, key="current_collection", 
+                index=collections.index(st.session_state.current_collection) if st.session_state.current_collection in collections else 0)
+    
+    # View buttons
+    col_a, col_b = st.columns(2)
+    with col_a:
+        st.button("View Saved", on_click=app_scoped(view_saved_words), 
+                 disabled=len(st.session_state.saved_collections[st.session_state.current_collection]) == 0,
+                 key="view_saved_button")
+    with col_b:
+        st.button("View All", on_click=app_scoped(view_all_words), disabled=not st.session_state.viewing_saved,
+                 key="view_all_button")
+    
+    # Display mode indicator
+    if st.session_state.viewing_saved:
+        st.info(f"Viewing saved words from '{st.session_state.current_collection}'")
+    
+    # Manually add vocabulary
+    st.header("Add Vocabulary Manually")
+    st.text_input("German Word:", key="new_german")
+    st.text_input("English Translation:", key="new_english")
+    st.text_input("Article (der/die/das):", key="new_article")
+    st.text_input("Category:", key="new_category")
+    st.selectbox("Level:", CEFR_LEVELS, key="new_level")
+    st.button("Add Word", on_click=app_scoped(add_vocabulary), key="add_word_button")
+    
+    # Generate several words with a single API call
+    st.header("Generate Words in Bulk")
+    st.number_input("Words per batch:", min_value=1, max_value=MAX_BATCH_SIZE, value=BATCH_SIZE,
+                    step=1, key="batch_size")
+    st.number_input("Parallel batches:", min_value=1, max_value=MAX_BATCH_PARALLEL, value=1,
+                    step=1, key="batch_parallel")
+    st.button("Generate Batch", on_click=app_scoped(generate_word_batch), key="generate_batch_button",
+              disabled=model is None)
+    if st.session_state.get("batch_stats"):
+        batch_stats = st.session_state.batch_stats
+        st.caption(f"Last batch: {batch_stats['words']}/{batch_stats['requested']} words in "
+                   f"{batch_stats['seconds']:.1f}s ({batch_stats['words_per_second']:.2f} words/s, "
+                   f"{batch_stats['tokens_per_word']:.0f} tokens/word)")
+        if batch_stats.get("rejected"):
+            st.caption("Rejected entries: " + ", ".join(
+                f"{reason.replace('_', ' ')} {count}" for reason, count in batch_stats["rejected"].items()))
+    
+    # Button to view all vocabulary as a table
+    st.button("View All Vocabulary Table", on_click=app_scoped(toggle_vocab_table), key="view_vocab_table_button")
+    
+    # Export vocabulary; files are only encoded on request and reused until the words change
+    st.header("Export Vocabulary")
+    st.selectbox("Format:", list(EXPORT_FORMATS), key="export_format")
+    st.selectbox("Words:", [None, *st.session_state.saved_collections], key="export_scope",
+                 format_func=lambda scope: "All words" if scope is None else f"Collection '{scope}'")
+    export = current_export()
+    if export is None:
+        st.button("Prepare Export", on_click=prepare_export, key="prepare_export_button")
+    else:
+        _, extension, mime = EXPORT_FORMATS[export["format"]]
+        scope = st.session_state.export_scope
         st.download_button(
-            label="Export Vocabulary (CSV)",
-            data=export_vocab(),
-            file_name="german_vocabulary.csv",
-            mime="text/csv",
+            label=f"Download {export['format']} ({len(export['data']) / 1024:.0f} KB)",
+            data=export["data"],
+            file_name=f"german_vocabulary.{extension}" if scope is None else f"german_{scope}.{extension}",
+            mime=mime,
             key="export_vocab_button"
         )
-        
-        # Current vocabulary count
-        st.caption(f"Total vocabulary words: {len(st.session_state.vocabulary)}")
-        
-        # Saved words count
-        collection = st.session_state.current_collection
-        st.caption(f"Words in '{collection}' collection: {len(st.session_state.saved_collections[collection])}")
+        if st.session_state.get("debug_mode"):
+            st.caption(f"Export encoded in {export['seconds'] * 1000:.0f} ms")
+    
+    # Current vocabulary count
+    st.caption(f"Total vocabulary words: {len(st.session_state.vocabulary)}")
+    
+    # Saved words count
+    collection = st.session_state.current_collection
+    st.caption(f"Words in '{collection}' collection: {len(st.session_state.saved_collections[collection])}")
 
 #
 # Initialize Session State
 #
 
+@timed_phase("init_session_state")
 def init_session_state():
     """Initialize all session state variables"""
-    # Empty vocabulary list - no default words
+    # Each session's deck is loaded from the database once, then written incrementally;
+    # without a database there is no deck to reload, so the URL is left alone
+    database = get_database()
+    if "deck_id" not in st.session_state:
+        st.session_state.deck_id = get_deck_id() if database is not None else None
+    
+    # Empty vocabulary - no default words; indexed for duplicate checks and filtered picks,
+    # holding only IDs of records in the shared word table
     if "vocabulary" not in st.session_state:
-        st.session_state.vocabulary = []
+        words = database.load_words(st.session_state.deck_id) if database is not None else []
+        st.session_state.vocabulary = VocabularyStore(words)
     
     if "current_word" not in st.session_state:
         # We'll populate this with a Gemini-generated word in the main function
         st.session_state.current_word = {}
     
     if "score" not in st.session_state:
-        st.session_state.score = 0
+        score, total_attempts = database.load_score(st.session_state.deck_id) if database is not None else (0, 0)
+        st.session_state.score = score
+        st.session_state.total_attempts = total_attempts
     
     if "total_attempts" not in st.session_state:
         st.session_state.total_attempts = 0
@@ -717,7 +1451,13 @@ def init_session_state():
         st.session_state.level_filter = "All"
     
     if "saved_collections" not in st.session_state:
-        st.session_state.saved_collections = {"Default": []}
+        # Collections hold IDs of words in the shared word table
+        st.session_state.saved_collections = {"Default": WordCollection()}
+        if database is not None:
+            collections = database.load_collections(st.session_state.deck_id, st.session_state.vocabulary.get)
+            st.session_state.saved_collections.update(
+                (name, WordCollection(words)) for name, words in collections.items()
+            )
     
     if "current_collection" not in st.session_state:
         st.session_state.current_collection = "Default"
@@ -734,13 +1474,19 @@ def init_session_state():
     if "show_vocab_table" not in st.session_state:
         st.session_state.show_vocab_table = False
     
-    if "history_df" not in st.session_state:
-        # Initialize empty dataframe to store all words history
-        st.session_state.history_df = pd.DataFrame(columns=["german", "english", "article", "category", "level"])
+    if "history" not in st.session_state:
+        # IDs of all words in the shared word table, materialized as a dataframe on demand
+        st.session_state.history = HistoryStore(st.session_state.vocabulary)
     
     if "has_initial_word" not in st.session_state:
-        st.session_state.has_initial_word = False
+        # A deck restored from the database already has words to show
+        st.session_state.has_initial_word = len(st.session_state.vocabulary) > 0
+        if st.session_state.has_initial_word:
+            st.session_state.current_word = st.session_state.vocabulary.random_choice()
         
+    if "word_source" not in st.session_state:
+        st.session_state.word_source = "gemini"
+    
     # No default API key - we want to ensure user always provides their own
     if "api_key" not in st.session_state:
         st.session_state.api_key = ""
@@ -750,6 +1496,9 @@ def init_session_state():
 #
 
 def main():
+    cpu_start = thread_time()
+    app_start = perf_counter()
+    
     # Apply custom CSS styles
     apply_styles()
     
@@ -760,42 +1509,54 @@ def main():
     st.title("🇩🇪 German Vocabulary Builder")
     st.markdown("Learn German vocabulary with AI-powered flashcards")
     
-    # Initialize Gemini
+    # Initialize Gemini (cached per API key, so this is a dictionary lookup after the first run)
+    setup_start = perf_counter()
     model = configure_genai()
+    st.session_state.client_setup_seconds = perf_counter() - setup_start
+    get_metrics().observe("phase_seconds", st.session_state.client_setup_seconds, phase="configure_genai")
     
-    # Store model in session state for future use if available
-    if model:
-        st.session_state.model = model
+    # Store the model (None without a key) for callbacks
+    st.session_state.model = model
     
     # Render sidebar (always render sidebar even if model is None)
-    render_sidebar(model)
+    with get_metrics().time("phase_seconds", phase="sidebar"):
+        score_box = render_sidebar(model)
     
-    # Check if model is available before proceeding with the main content
+    # Without a model the app still works from the bundled word lists
     if model is None:
-        st.info("Please provide a valid Gemini API key in the sidebar to use this app.")
-        return
+        st.info("Practising with the bundled word lists. Add a Gemini API key in the sidebar "
+                "for AI-generated words and example sentences.")
     
     # Generate first word if we don't have one yet and we have a valid model
     if not st.session_state.has_initial_word:
-        with st.spinner("Generating your first vocabulary word..."):
-            new_word = generate_new_word(model)
-            if new_word and all(key in new_word for key in ["german", "english", "article", "category", "level"]):
-                st.session_state.vocabulary.append(new_word)
+        first_word_timer = get_metrics().time("phase_seconds", phase="first_word")
+        with st.spinner("Generating your first vocabulary word..."), first_word_timer:
+            # Reuse a word another session generated, else show a bundled word at once while
+            # the flashcard view starts prefetching from Gemini; a live call is the last resort
+            vocabulary = st.session_state.vocabulary
+            source = get_word_source(model)
+            new_word = None if source.instant else get_word_pool().draw(None, None, vocabulary)
+            new_word = new_word or get_local_word_source().new_word(None, None, vocabulary)
+            if new_word is None and not source.instant:
+                new_word = generate_new_word(model)
+            if is_complete_word(new_word):
+                add_words_to_vocabulary([new_word])
                 st.session_state.current_word = new_word
-                st.session_state.history_df = pd.concat([
-                    st.session_state.history_df, 
-                    pd.DataFrame([new_word])
-                ], ignore_index=True)
                 st.session_state.has_initial_word = True
             else:
                 st.error("Failed to generate the first word. Please check your API key and try again.")
                 return
     
-    # Main content - Card display or Table view
+    # Main content - Card display (its own fragment) or Table view
     if st.session_state.show_vocab_table:
+        keep_prefetch_warm(model)
         render_vocabulary_table()
     else:
-        render_flashcard_view(model)
+        render_flashcard_view(model, score_box)
+    
+    st.session_state.app_cpu_seconds = thread_time() - cpu_start
+    get_metrics().observe("phase_seconds", perf_counter() - app_start, phase="app")
+    get_metrics().maybe_dump()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
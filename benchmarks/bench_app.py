@@ -0,0 +1,218 @@
+"""End-to-end rerun latency and session memory, driving app.py headlessly.
+
+Runs the app with Streamlit's AppTest against a deterministic fake Gemini
+model and times the learner flows at several deck sizes: loading a deck,
+next word, wrong and correct answers, saving a word, opening and paging the
+vocabulary table, searching it, and preparing a CSV export. A fresh empty
+deck also times the first-word bootstrap. Times are wall-clock per
+interaction and include AppTest's own overhead; AppTest always reruns the
+whole script, so fragment-scoped reruns are not reflected. Memory is the
+traced allocation retained by a session after its first run, including
+the deck itself.
+
+Results are compared with the saved baseline (benchmarks/app_baseline.json)
+and regressions are flagged; --save overwrites the baseline.
+
+Run from the repository root: python benchmarks/bench_app.py [sizes...] [--repeats N] [--latency S] [--save]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from statistics import median
+from time import perf_counter
+
+# The app reads its configuration at import time: no persistence
+CACHE_DIR = tempfile.mkdtemp(prefix="vocab-bench-")
+os.environ.pop("VOCAB_DB_PATH", None)
+os.environ.pop("VOCAB_METRICS_PATH", None)
+os.environ.pop("VOCAB_LLM_CACHE_MODE", None)
+os.environ["VOCAB_EXAMPLE_CACHE"] = os.path.join(CACHE_DIR, "examples.sqlite3")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import google.generativeai as genai  # noqa: E402
+import streamlit as st  # noqa: E402
+from google.generativeai import client as genai_client  # noqa: E402
+from streamlit.logger import set_log_level  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from fake_words import EXAMPLES, fake_word  # noqa: E402
+from vocabulary_store import VocabularyStore  # noqa: E402
+
+SIZES = [10, 1000, 10000, 100000]
+REPEATS = 5
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "app_baseline.json")
+# A flow is flagged when it is this much slower than the baseline, and by at least REGRESSION_MIN_MS
+REGRESSION_RATIO = 1.25
+REGRESSION_MIN_MS = 5.0
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+
+class FakeModel:
+    """Stand-in for genai.GenerativeModel: fresh words for word prompts, fixed example sentences"""
+
+    model_name = "models/fake"
+    latency = 0.0
+    # Generated words never collide with preloaded decks
+    next_id = 5_000_000
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        time.sleep(self.latency)
+        if "example sentences" in prompt:
+            return [FakeResponse(line + "\n") for line in EXAMPLES.splitlines()] if stream else FakeResponse(EXAMPLES)
+        word = fake_word(FakeModel.next_id)
+        FakeModel.next_id += 1
+        return FakeResponse(json.dumps(word, ensure_ascii=False))
+
+
+def install_fake_model(latency):
+    FakeModel.latency = latency
+    genai.configure = lambda **kwargs: None
+    genai.GenerativeModel = FakeModel
+    genai_client.get_default_generative_client = lambda: None
+
+
+def new_session(words):
+    """A fresh AppTest session (and fresh process-wide caches) with ``words`` preloaded"""
+    st.cache_resource.clear()
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=600)
+    at.session_state.api_key = "benchmark"
+    if words is not None:
+        at.session_state.vocabulary = VocabularyStore(words)
+    return at
+
+
+def timed(action):
+    start = perf_counter()
+    action()
+    return (perf_counter() - start) * 1000
+
+
+def wait_for_card(at):
+    """Rerun until a background-generated word is on the card"""
+    for _ in range(200):
+        if "pending_word" not in at.session_state or at.session_state["pending_word"] is None:
+            return
+        time.sleep(0.005)
+        at.run()
+
+
+def button(at, label):
+    return next(b for b in at.button if b.label == label)
+
+
+def run_flows(at, repeats):
+    """Time each flow ``repeats`` times; returns flow name -> list of milliseconds"""
+    flows = {name: [] for name in ("next_word", "wrong_answer", "correct_answer", "save_word",
+                                   "table_view", "table_page", "table_search", "export_csv")}
+    for i in range(repeats):
+        flows["next_word"].append(timed(lambda: button(at, "Next Word").click().run()))
+        flows["wrong_answer"].append(timed(lambda: at.text_input(key="user_answer").input(f"wrong {i}").run()))
+        answer = at.session_state.current_word["english"]
+        flows["correct_answer"].append(timed(lambda: at.text_input(key="user_answer").input(answer).run()))
+        wait_for_card(at)
+
+        button(at, "Next Word").click().run()
+        flows["save_word"].append(timed(lambda: button(at, "Save Word").click().run()))
+
+        flows["table_view"].append(timed(lambda: at.button(key="view_vocab_table_button").click().run()))
+        pages = at.number_input(key="table_page")
+        flows["table_page"].append(timed(lambda: pages.set_value(min(pages.max or 1, i + 2)).run()))
+        flows["table_search"].append(timed(lambda: at.text_input(key="table_search").input(f"thing {'ab'[i % 2]}").run()))
+        at.text_input(key="table_search").input("").run()
+        at.button(key="return_to_flashcards").click().run()
+
+        # A new word changes the vocabulary, so the export is encoded again
+        button(at, "Next Word").click().run()
+        at.selectbox(key="export_format").set_value("CSV").run()
+        flows["export_csv"].append(timed(lambda: at.button(key="prepare_export_button").click().run()))
+    return flows
+
+
+def measure(size, repeats):
+    """Flow timings (ms) and retained session memory (MB) for a deck of ``size`` words"""
+    def deck():
+        return [fake_word(i) for i in range(size)] if size else None
+
+    # Memory is traced in a separate session because tracing slows everything down
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    traced = new_session(deck())
+    traced.run()
+    memory_mb = (tracemalloc.get_traced_memory()[0] - before) / 1e6
+    tracemalloc.stop()
+    del traced
+
+    at = new_session(deck())
+    load_ms = timed(at.run)
+    if at.exception:
+        raise RuntimeError(f"App raised on load: {at.exception[0].value}")
+    results = {("bootstrap" if not size else "load"): [load_ms]}
+    if size:
+        # One unmeasured pass warms the prefetcher and the styled table pages
+        run_flows(at, 1)
+        results.update(run_flows(at, repeats))
+    if at.exception:
+        raise RuntimeError(f"App raised: {at.exception[0].value}")
+    return results, memory_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=SIZES)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the fake model takes per call")
+    parser.add_argument("--save", action="store_true", help="save these results as the new baseline")
+    args = parser.parse_args()
+    install_fake_model(args.latency)
+    set_log_level("error")
+    # Imports and first-use setup would otherwise land in the first measurement
+    measure(10, 1)
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH) and not args.save:
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    results = {}
+    print(f"{'words':>7} | {'flow':<14} | {'median (ms)':>11} | {'max (ms)':>8} | {'baseline (ms)':>13} | change")
+    for size in [0] + [size for size in args.sizes if size]:
+        flows, memory_mb = measure(size, args.repeats)
+        results[f"{size}/memory_mb"] = memory_mb
+        for flow, samples in flows.items():
+            key = f"{size}/{flow}"
+            results[key] = median(samples)
+            change = ""
+            if key in baseline:
+                ratio = results[key] / baseline[key] if baseline[key] else 1.0
+                change = f"{ratio - 1:+.0%}"
+                if ratio > REGRESSION_RATIO and results[key] - baseline[key] > REGRESSION_MIN_MS:
+                    change += "  REGRESSION"
+            print(f"{size:>7} | {flow:<14} | {median(samples):>11.1f} | {max(samples):>8.1f} | "
+                  f"{baseline.get(key, float('nan')):>13.1f} | {change}")
+        print(f"{size:>7} | {'memory (MB)':<14} | {memory_mb:>11.1f} | {'':>8} | "
+              f"{baseline.get(f'{size}/memory_mb', float('nan')):>13.1f} |")
+
+    if args.save:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"repeats": args.repeats, "latency": args.latency,
+                       "results": {key: round(value, 2) for key, value in results.items()}}, f, indent=2)
+            f.write("\n")
+        print(f"Saved baseline to {os.path.relpath(BASELINE_PATH)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Per-rerun cost of setting up the Gemini client, rebuilt vs cached per API key.
+
+The old ``configure_genai`` called ``genai.configure`` and built a new
+``GenerativeModel`` on every rerun, which also forced a fresh API client (and
+channel) on the next request. No requests are sent, so any key works.
+
+Run from the repository root: python benchmarks/bench_client_setup.py
+"""
+from time import perf_counter
+
+import google.generativeai as genai
+from google.generativeai import client as genai_client
+
+RERUNS = 50
+API_KEY = "benchmark-key"
+
+
+def rebuild():
+    genai.configure(api_key=API_KEY)
+    model = genai.GenerativeModel('gemini-2.5-flash')
+    model._client = genai_client.get_default_generative_client()
+    return model
+
+
+def main():
+    start = perf_counter()
+    for _ in range(RERUNS):
+        rebuild()
+    rebuilt = (perf_counter() - start) / RERUNS
+
+    models = {API_KEY: rebuild()}
+    start = perf_counter()
+    for _ in range(RERUNS):
+        models[API_KEY]
+    cached = (perf_counter() - start) / RERUNS
+
+    print(f"rebuilt every rerun: {rebuilt * 1000:.3f} ms")
+    print(f"cached per API key:  {cached * 1000:.5f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Near-duplicate checks: VocabularyStore vs scanning every stored word.
+
+Offers exact repeats, article/case/umlaut variants, one-letter typos (with
+the stored word's translation) and genuinely new words to a deck and reports
+the time per check and how many of each kind are caught. The ``numbered``
+row builds a store from words like "das Testwort12" that are all within a
+few edits of each other but translate differently; it reports the build
+time per word, which must not grow with the deck, and how many were wrongly
+rejected.
+
+Run from the repository root: python benchmarks/bench_duplicates.py [sizes...]
+"""
+import os
+import random
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from near_duplicates import normalize_german, within_one_edit  # noqa: E402
+from vocabulary_store import VocabularyStore  # noqa: E402
+
+SIZES = [1000, 10000, 100000]
+CHECKS = 200
+SYLLABLES = ["an", "bä", "ber", "da", "ein", "er", "fahr", "ge", "hand", "haus", "kat", "lauf", "lich",
+             "mann", "nör", "rad", "schü", "stein", "straße", "tag", "ter", "ung", "ver", "wald", "zeit"]
+
+
+def make_word(i, rng):
+    stem = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+    return {"german": f"{rng.choice(['der', 'die', 'das'])} {stem.capitalize()}{i}", "english": f"thing {i}",
+            "category": "misc", "level": "A1"}
+
+
+def variant(german, rng):
+    article, stem = german.split(" ", 1)
+    stem = stem.replace("ä", "ae").replace("ö", "oe").replace("ü", "ue").replace("ß", "ss")
+    return rng.choice([stem, f" {article.upper()} {stem.lower()} "])
+
+
+def typo(german, rng):
+    position = rng.randrange(len(german) - 6, len(german) - 1)
+    return german[:position] + german[position + 1:]
+
+
+def scan_is_duplicate(words, german):
+    key = normalize_german(german)
+    return any(within_one_edit(key, normalize_german(word["german"])) for word in words)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    rng = random.Random(0)
+    print(f"{'words':>7} | {'kind':<8} | {'caught':>6} | {'store (us)':>10} | {'scan (ms)':>9}")
+    for size in sizes:
+        words = [make_word(i, rng) for i in range(size)]
+        store = VocabularyStore(words)
+        stored = rng.sample(words, CHECKS)
+        kinds = {
+            "exact": [(word["german"], word["english"]) for word in stored],
+            "variant": [(variant(word["german"], rng), word["english"]) for word in stored],
+            "typo": [(typo(word["german"], rng), word["english"]) for word in stored],
+            "new": [(word["german"], word["english"]) for word in (make_word(size + i, rng) for i in range(CHECKS))],
+        }
+        for kind, candidates in kinds.items():
+            start = perf_counter()
+            caught = sum(store.duplicate_reason(german, english) is not None for german, english in candidates)
+            store_us = (perf_counter() - start) / CHECKS * 1e6
+            start = perf_counter()
+            for german, _ in candidates[:5]:
+                scan_is_duplicate(words, german)
+            scan_ms = (perf_counter() - start) / 5 * 1000
+            print(f"{size:>7} | {kind:<8} | {caught / CHECKS:>6.0%} | {store_us:>10.1f} | {scan_ms:>9.2f}")
+        numbered = [{"german": f"das Testwort{i}", "english": f"test word {i}", "category": "misc", "level": "A1"}
+                    for i in range(size)]
+        start = perf_counter()
+        kept = len(VocabularyStore(numbered))
+        build_us = (perf_counter() - start) / size * 1e6
+        print(f"{size:>7} | {'numbered':<8} | {1 - kept / size:>6.0%} | {build_us:>10.1f} | {'-':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Prompt size and per-call cost of duplicate exclusion as the vocabulary grows.
+
+Compares listing every known word in the prompt (the old behaviour) against the
+bounded exclusion list from ``VocabularyStore``. The model is a stand-in whose latency
+grows with prompt length, so no API key is needed.
+
+Run from the repository root: python benchmarks/bench_exclusion.py
+"""
+import json
+import os
+import sys
+from time import perf_counter, sleep
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocabulary_store import VocabularyStore  # noqa: E402
+from word_sources import GeminiWordSource  # noqa: E402
+
+SIZES = [10, 100, 1000, 10000]
+CALLS = 20
+
+# Simulated model latency: fixed round trip plus time per prompt token (~4 chars)
+BASE_LATENCY = 0.002
+LATENCY_PER_TOKEN = 0.000002
+
+
+class FakeModel:
+    def __init__(self):
+        self.last_prompt_chars = 0
+
+    def generate_content(self, prompt):
+        self.last_prompt_chars = len(prompt)
+        sleep(BASE_LATENCY + LATENCY_PER_TOKEN * len(prompt) / 4)
+        return type("Response", (), {"text": json.dumps({
+            "german": "das Neuwort", "english": "new word", "article": "das",
+            "category": "misc", "level": "A1"})})()
+
+
+def make_vocabulary(size):
+    categories = ["animals", "food", "places", "verbs"]
+    levels = ["A1", "A2", "B1", "B2", "C1", "C2"]
+    return [{"german": f"das Wort{i}", "english": f"word {i}", "article": "das",
+             "category": categories[i % len(categories)], "level": levels[i % len(levels)]}
+            for i in range(size)]
+
+
+def run(size):
+    vocabulary = make_vocabulary(size)
+    store = VocabularyStore(vocabulary)
+    model = FakeModel()
+    source = GeminiWordSource(model)
+    results = {}
+
+    for strategy in ("all words", "bounded"):
+        start = perf_counter()
+        for _ in range(CALLS):
+            if strategy == "all words":
+                existing_words = set(word["german"] for word in vocabulary)
+            else:
+                existing_words = store.exclusion_list("food", "A2")
+            new_word = source.new_word("food", "A2", existing_words=existing_words)
+            if strategy == "all words":
+                any(w["german"] == new_word["german"] for w in vocabulary)
+            else:
+                new_word["german"] in store
+        results[strategy] = (model.last_prompt_chars, (perf_counter() - start) / CALLS * 1000)
+    return results
+
+
+def main():
+    print(f"{'words':>7} | {'prompt chars (all)':>18} {'ms/call (all)':>13} | "
+          f"{'prompt chars (bounded)':>22} {'ms/call (bounded)':>17}")
+    for size in SIZES:
+        results = run(size)
+        all_chars, all_ms = results["all words"]
+        bounded_chars, bounded_ms = results["bounded"]
+        print(f"{size:>7} | {all_chars:>18} {all_ms:>13.2f} | {bounded_chars:>22} {bounded_ms:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Per-word appends to the vocabulary history: pd.concat vs HistoryStore.
+
+The old code concatenated a one-row DataFrame onto ``history_df`` for every
+word. HistoryStore appends word IDs to an array and builds the DataFrame once.
+
+Run from the repository root: python benchmarks/bench_history.py [sizes...]
+"""
+import os
+import sys
+from time import perf_counter
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import HISTORY_COLUMNS, HistoryStore  # noqa: E402
+
+SIZES = [1000, 10000, 100000]
+
+
+def make_word(i):
+    return {"german": f"das Wort{i}", "english": f"word {i}", "article": "das",
+            "category": "misc", "level": "A1"}
+
+
+def bench_concat(size):
+    history_df = pd.DataFrame(columns=HISTORY_COLUMNS)
+    start = perf_counter()
+    for i in range(size):
+        history_df = pd.concat([history_df, pd.DataFrame([make_word(i)])], ignore_index=True)
+    return perf_counter() - start
+
+
+def bench_store(size):
+    history = HistoryStore()
+    start = perf_counter()
+    for i in range(size):
+        history.append(make_word(i))
+    history.to_dataframe()
+    return perf_counter() - start
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'appends':>8} | {'pd.concat (s)':>13} | {'HistoryStore (s)':>16} | {'speedup':>8}")
+    for size in sizes:
+        concat_seconds = bench_concat(size)
+        store_seconds = bench_store(size)
+        print(f"{size:>8} | {concat_seconds:>13.3f} | {store_seconds:>16.3f} | "
+              f"{concat_seconds / store_seconds:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Generation response parsing: corpus check, fuzzing and speed against the old regexes.
+
+The corpus in parser_corpus.jsonl holds malformed responses seen from the
+model (prose around the JSON, code fences, truncation, trailing commas,
+wrong levels, ...) with the expected word count and rejection reasons.
+The fuzzer mutates corpus entries and checks the parser never raises and
+only returns valid words. The benchmark compares parse_words with the old
+greedy ``{.*}`` single-word fallback and the flat-object batch fallback.
+
+Run from the repository root: python benchmarks/bench_parser.py [fuzz iterations]
+"""
+import json
+import os
+import random
+import re
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from response_parser import parse_words, validate_word  # noqa: E402
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parser_corpus.jsonl")
+FUZZ_ITERATIONS = 20000
+SIZES = [10, 100, 1000]
+MUTATION_CHARACTERS = '{}[]",:\\ \n`'
+
+
+def load_corpus():
+    with open(CORPUS_PATH, encoding="utf-8") as corpus:
+        return [json.loads(line) for line in corpus if line.strip()]
+
+
+def legacy_parse_single(text):
+    """The old request_new_word parsing"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        match = re.search(r'{.*}', text, re.DOTALL)
+        if match:
+            try:
+                return json.loads(match.group(0))
+            except json.JSONDecodeError:
+                return None
+        return None
+
+
+def legacy_parse_batch(text):
+    """The old parse_word_batch fallback"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        entries = []
+        for match in re.findall(r'{[^{}]*}', text):
+            try:
+                entries.append(json.loads(match))
+            except json.JSONDecodeError:
+                continue
+        return entries
+
+
+def check_corpus(corpus):
+    failures = 0
+    for case in corpus:
+        result = parse_words(case["text"], "A1")
+        reasons = [rejection.reason for rejection in result.rejections]
+        if len(result.words) != case["words"] or reasons != case["rejections"]:
+            failures += 1
+            print(f"  FAIL {case['name']}: {len(result.words)} words, {reasons}; "
+                  f"expected {case['words']} words, {case['rejections']}")
+    print(f"corpus: {len(corpus) - failures}/{len(corpus)} cases as expected")
+    return failures
+
+
+def mutate(text, rng):
+    """Truncate, delete, duplicate or insert structural characters"""
+    text = list(text)
+    for _ in range(rng.randint(1, 4)):
+        operation = rng.randrange(4)
+        position = rng.randint(0, len(text))
+        if operation == 0:
+            del text[position:]
+        elif operation == 1 and position < len(text):
+            del text[position]
+        elif operation == 2 and position < len(text):
+            text.insert(position, text[position])
+        else:
+            text.insert(position, rng.choice(MUTATION_CHARACTERS))
+    return "".join(text)
+
+
+def fuzz(corpus, iterations, seed=0):
+    rng = random.Random(seed)
+    problems = 0
+    start = perf_counter()
+    for _ in range(iterations):
+        text = mutate(rng.choice(corpus)["text"], rng)
+        try:
+            result = parse_words(text, "A1")
+        except Exception as e:
+            problems += 1
+            print(f"  RAISED {type(e).__name__}: {e!r} on {text[:80]!r}")
+            continue
+        for word in result.words:
+            if validate_word(word)[0] != word:
+                problems += 1
+                print(f"  INVALID {word!r} from {text[:80]!r}")
+    elapsed = perf_counter() - start
+    print(f"fuzz: {iterations} mutated responses, {problems} problems, "
+          f"{elapsed / iterations * 1e6:.0f} us/response")
+    return problems
+
+
+def make_responses(size):
+    words = [json.dumps({"german": f"das Wort{i}", "english": f"word {i}", "article": "das",
+                         "category": "misc", "level": "A1"}) for i in range(size)]
+    array = "[" + ",\n".join(words) + "]"
+    return {
+        "clean array": array,
+        "prose + fence": f"Here are your words:\n```json\n{array}\n```\nHave fun {{learning}}!",
+        "truncated": array[:-len(words[-1]) // 2],
+        "unclosed braces": "{" * size * 10,
+    }
+
+
+def timed(parse, text, repeat):
+    start = perf_counter()
+    for _ in range(repeat):
+        result = parse(text)
+    return (perf_counter() - start) / repeat, result
+
+
+def count_words(result):
+    if isinstance(result, dict):
+        result = [result]
+    return sum(isinstance(entry, dict) and "german" in entry for entry in result or [])
+
+
+def bench(sizes):
+    print(f"{'words':>6} | {'response':<15} | {'old single (ms)':>15} | {'old batch (ms)':>14} | "
+          f"{'parse_words (ms)':>16} | {'words old/old/new':>17}")
+    for size in sizes:
+        repeat = max(1, 1000 // size)
+        for name, text in make_responses(size).items():
+            single_seconds, single = timed(legacy_parse_single, text, repeat)
+            batch_seconds, batch = timed(legacy_parse_batch, text, repeat)
+            parser_seconds, parsed = timed(parse_words, text, repeat)
+            counts = f"{count_words(single)}/{count_words(batch)}/{len(parsed.words)}"
+            print(f"{size:>6} | {name:<15} | {single_seconds * 1000:>15.3f} | {batch_seconds * 1000:>14.3f} | "
+                  f"{parser_seconds * 1000:>16.3f} | {counts:>17}")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else FUZZ_ITERATIONS
+    corpus = load_corpus()
+    failures = check_corpus(corpus) + fuzz(corpus, iterations)
+    bench(SIZES)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Vocabulary search: SearchIndex lookups vs scanning the vocabulary.
+
+Builds decks of pseudo-German words and times prefix, article-free, and
+misspelled (fuzzy) queries against a linear substring scan, plus the cost
+of adding words one at a time to an existing index.
+
+Run from the repository root: python benchmarks/bench_search.py [sizes...]
+"""
+import os
+import random
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex  # noqa: E402
+
+SIZES = [1000, 10000, 100000]
+QUERIES = 200
+SYLLABLES = ["an", "be", "ber", "da", "ein", "er", "fahr", "ge", "hand", "haus", "kat", "lauf", "lich",
+             "mann", "ner", "rad", "sch", "stein", "tag", "ter", "ung", "ver", "wald", "zeit", "zug"]
+
+
+def make_words(size, rng):
+    words = []
+    for i in range(size):
+        stem = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        article = rng.choice(["der", "die", "das", ""])
+        german = f"{article} {stem.capitalize()}{i}" if article else f"{stem}{i}"
+        words.append({"german": german, "english": f"thing {stem[::-1]} {i}", "article": article,
+                      "category": "misc", "level": "A1"})
+    return words
+
+
+def misspell(text, rng):
+    position = rng.randrange(1, len(text) - 1)
+    return text[:position] + text[position + 1:]
+
+
+def scan(words, query):
+    query = query.casefold()
+    return [i for i, word in enumerate(words)
+            if query in word["german"].casefold() or query in word["english"].casefold()]
+
+
+def per_query_ms(fn, queries):
+    start = perf_counter()
+    for query in queries:
+        fn(query)
+    return (perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    rng = random.Random(0)
+    print(f"{'words':>7} | {'build (s)':>9} | {'add (us)':>8} | {'scan (ms)':>9} | {'prefix (ms)':>11} | "
+          f"{'no article (ms)':>15} | {'fuzzy (ms)':>10} | {'fuzzy hit rate':>14}")
+    for size in sizes:
+        words = make_words(size, rng)
+        start = perf_counter()
+        index = SearchIndex(words[:-1000])
+        build_seconds = perf_counter() - start
+        start = perf_counter()
+        for word in words[-1000:]:
+            index.add(word)
+        add_us = (perf_counter() - start) / 1000 * 1e6
+
+        targets = rng.sample(range(size), QUERIES)
+        stems = [words[i]["german"].split()[-1] for i in targets]
+        prefixes = [stem[:5] for stem in stems]
+        with_articles = [words[i]["german"] for i in targets]
+        typos = [misspell(stem, rng) for stem in stems]
+        hits = sum(target in index.fuzzy(typo) for target, typo in zip(targets, typos))
+
+        print(f"{size:>7} | {build_seconds:>9.2f} | {add_us:>8.0f} | {per_query_ms(lambda q: scan(words, q), prefixes[:20]):>9.2f} | "
+              f"{per_query_ms(index.prefix, prefixes):>11.3f} | {per_query_ms(index.search, with_articles):>15.3f} | "
+              f"{per_query_ms(index.fuzzy, typos):>10.3f} | {hits / QUERIES:>13.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Picking a word from the bundled lists with LocalWordSource.
+
+The learner already knows the N most frequent bundled words plus a deck of
+generated words. For each filter, the first pick scans past the known words;
+later picks, each followed by learning the word, resume where the previous
+scan stopped.
+
+Run from the repository root: python benchmarks/bench_word_sources.py [known words...]
+"""
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_words import fake_word  # noqa: E402
+from vocabulary_store import VocabularyStore  # noqa: E402
+from word_sources import LocalWordSource, load_word_lists  # noqa: E402
+
+SIZES = [0, 50, 200, 300]
+# Generated words in the deck besides the bundled ones
+DECK_SIZE = 10000
+# Picks after the first, each followed by adding the word to the deck
+PICKS = 20
+FILTERS = {"none": (None, None), "level": (None, "B1"), "category": ("food", None), "both": ("food", "B1")}
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    bundled = load_word_lists()
+    source = LocalWordSource(bundled)
+    # Built once; every filter starts from a copy
+    deck = VocabularyStore(fake_word(i) for i in range(DECK_SIZE))
+    print(f"bundled words: {len(source)}")
+    print(f"{'known':>5} | {'filter':<8} | {'first pick (us)':>15} | {'next picks (us)':>15} | first word")
+    for size in sizes:
+        known = deck.copy()
+        known.extend(bundled[:size])
+        for name, (category, level) in FILTERS.items():
+            vocabulary = known.copy()
+            start = perf_counter()
+            word = source.new_word(category, level, vocabulary)
+            first_us = (perf_counter() - start) * 1e6
+            first = word["german"] if word else "-"
+            picks = 0
+            elapsed = 0.0
+            while word is not None and picks < PICKS:
+                vocabulary.add(word)
+                start = perf_counter()
+                word = source.new_word(category, level, vocabulary)
+                elapsed += perf_counter() - start
+                picks += 1
+            next_us = f"{elapsed / picks * 1e6:>15.1f}" if picks else f"{'-':>15}"
+            print(f"{size:>5} | {name:<8} | {first_us:>15.1f} | {next_us} | {first}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""Deterministic fake vocabulary shared by the benchmarks and the Gemini stub.
+
+Not a benchmark itself: bench_app.py and gemini_stub.py import it, so the
+AppTest benchmark and the load test generate the same words.
+"""
+
+ARTICLES = ["der", "die", "das", ""]
+CATEGORIES = ["animals", "food", "places", "verbs", "home", "work", "travel", "nature"]
+LEVELS = ["A1", "A2", "B1", "B2", "C1", "C2"]
+EXAMPLES = "German: Das ist gut.\nEnglish: That is good.\nGerman: Ich gehe heute.\nEnglish: I am going today.\n"
+
+
+def fake_word(i):
+    """Deterministic word; the doubled letter code keeps any two words at least two edits apart"""
+    article = ARTICLES[i % len(ARTICLES)]
+    code = ""
+    for _ in range(5):
+        i, digit = divmod(i, 26)
+        code += chr(ord("a") + digit)
+    stem = f"{code.capitalize()}{code}"
+    return {"german": f"{article} {stem}" if article else stem, "english": f"thing {code}", "article": article,
+            "category": CATEGORIES[sum(map(ord, code)) % len(CATEGORIES)], "level": LEVELS[ord(code[0]) % len(LEVELS)]}
@@ -0,0 +1,101 @@
+"""Local stand-in for the Gemini generateContent REST API, for load tests.
+
+Serves ``POST /v1beta/models/<model>:generateContent`` and
+``:streamGenerateContent`` with a configurable latency and error rate. Word
+prompts get a new, unique word each time; example-sentence prompts get a
+fixed pair of sentences, streamed one line per chunk. Failed requests
+answer 503 UNAVAILABLE, which the client treats as a transient error.
+
+Point the app at it with VOCAB_GEMINI_ENDPOINT=http://127.0.0.1:<port>.
+
+Run from the repository root: python benchmarks/gemini_stub.py [--port P] [--latency S] [--jitter F] [--error-rate R]
+"""
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fake_words import EXAMPLES, fake_word
+
+PORT = 8765
+
+
+def response_body(text, prompt):
+    return {
+        "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP", "index": 0}],
+        "usageMetadata": {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": len(text) // 4,
+                          "totalTokenCount": (len(prompt) + len(text)) // 4},
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Set by make_server
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+    word_ids = itertools.count()
+    word_ids_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        prompt = "".join(part.get("text", "") for content in request.get("contents", [])
+                         for part in content.get("parts", []))
+        time.sleep(max(0.0, self.latency * random.uniform(1 - self.jitter, 1 + self.jitter)))
+        if random.random() < self.error_rate:
+            self.send_json(503, {"error": {"code": 503, "message": "Stub overloaded", "status": "UNAVAILABLE"}})
+            return
+        if ":streamGenerateContent" in self.path:
+            # The REST transport reads a stream as one JSON array of responses
+            self.send_json(200, [response_body(line + "\n", prompt) for line in EXAMPLES.splitlines()])
+        elif ":generateContent" in self.path:
+            if "example sentences" in prompt:
+                text = EXAMPLES
+            else:
+                with self.word_ids_lock:
+                    text = json.dumps(fake_word(next(self.word_ids)), ensure_ascii=False)
+            self.send_json(200, response_body(text, prompt))
+        else:
+            self.send_json(404, {"error": {"code": 404, "message": f"Unknown path {self.path}", "status": "NOT_FOUND"}})
+
+
+def make_server(port=PORT, latency=0.0, jitter=0.0, error_rate=0.0):
+    """A threaded stub server on 127.0.0.1; call ``serve_forever`` to start it"""
+    handler = type("ConfiguredStubHandler", (StubHandler,),
+                   {"latency": latency, "jitter": jitter, "error_rate": error_rate})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per response")
+    parser.add_argument("--jitter", type=float, default=0.3, help="latency varies by up to this fraction")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    args = parser.parse_args()
+    server = make_server(args.port, args.latency, args.jitter, args.error_rate)
+    print(f"Gemini stub listening on http://127.0.0.1:{args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""Concurrent learner sessions against one Streamlit server and a local Gemini stand-in.
+
+Starts benchmarks/gemini_stub.py (or uses --endpoint) and a headless
+``streamlit run app.py`` pointed at it through VOCAB_GEMINI_ENDPOINT. For
+each session count, that many simulated browsers connect over Streamlit's
+websocket protocol at once. They send the same rerun requests the frontend
+would, including fragment reruns and the card's polling. Each session
+enters its own API key, because every learner brings their own. It then
+runs --rounds of: next word, show answer (which streams example sentences),
+and typing the correct answer, timed until the next card is on screen.
+
+Reports interactions per second, p50/p99 latency per interaction and the
+server's CPU time per interaction, so deployments can be sized. Needs the
+``websockets`` package.
+
+Run from the repository root: python benchmarks/load_test.py [session counts...] [--rounds N]
+    [--latency S] [--error-rate R] [--endpoint URL]
+"""
+import argparse
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from time import perf_counter
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.sync.client import connect
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SESSION_COUNTS = [1, 5, 10, 25, 50]
+ROUNDS = 5
+INTERACTIONS = ["first_word", "next_word", "show_answer", "correct_answer"]
+# The answer box on the card, as rendered by render_flashcard_view
+ANSWER_PATTERN = re.compile(r'font-size: 18px;">(.*?)</p>')
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def wait_for(url, process, seconds=60):
+    for _ in range(int(seconds / 0.1)):
+        if process.poll() is not None:
+            raise RuntimeError(f"{process.args[1:3]} exited with {process.returncode}")
+        try:
+            urllib.request.urlopen(url, timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+def start_stub(latency, error_rate):
+    port = free_port()
+    stub = subprocess.Popen([sys.executable, os.path.join(ROOT, "benchmarks", "gemini_stub.py"), "--port", str(port),
+                             "--latency", str(latency), "--error-rate", str(error_rate)],
+                            stdout=subprocess.DEVNULL)
+    endpoint = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return stub, endpoint
+        except OSError:
+            time.sleep(0.05)
+    stub.kill()
+    raise RuntimeError("Gemini stub did not start")
+
+
+def start_app(endpoint):
+    port = free_port()
+    env = dict(os.environ, VOCAB_GEMINI_ENDPOINT=endpoint,
+               VOCAB_EXAMPLE_CACHE=os.path.join(tempfile.mkdtemp(prefix="vocab-load-"), "examples.sqlite3"))
+    env.pop("VOCAB_DB_PATH", None)
+    app = subprocess.Popen([sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "app.py"),
+                            "--server.headless", "true", "--server.port", str(port),
+                            "--server.enableXsrfProtection", "false", "--browser.gatherUsageStats", "false"],
+                           env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wait_for(f"http://127.0.0.1:{port}/_stcore/health", app)
+    return app, port
+
+
+def cpu_seconds(pid):
+    """User plus system CPU time of a process, from /proc (Linux only; None elsewhere)"""
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            fields = stat.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def percentile(samples, percent):
+    """Nearest-rank percentile"""
+    ordered = sorted(samples)
+    return ordered[max(0, -(-len(ordered) * percent // 100) - 1)]
+
+
+class SimulatedSession:
+    """One browser tab: sends rerun requests over the websocket and tracks the widgets on screen"""
+
+    def __init__(self, websocket):
+        self._socket = websocket
+        self.widgets = {}
+        self.texts = []
+        self.errors = 0
+        self.auto_rerun = None
+
+    def rerun(self, changed=(), trigger=None, fragment_id="", is_auto_rerun=False):
+        """Send a rerun like the frontend does and wait until the script (or fragment) has finished.
+
+        ``changed`` holds (widget label, WidgetState field, value) updates; ``trigger``
+        is the label of a clicked button. The reply's elements replace ``texts``.
+        """
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.fragment_id = fragment_id
+        state.is_auto_rerun = is_auto_rerun
+        # Only changed widgets are sent; the server keeps the others' values
+        for label, field, value in changed:
+            widget = state.widget_states.widgets.add(id=self.widgets[label][0])
+            setattr(widget, field, value)
+        if trigger is not None:
+            state.widget_states.widgets.append(WidgetState(id=self.widgets[trigger][0], trigger_value=True))
+        self._socket.send(msg.SerializeToString())
+        self.texts = []
+        while True:
+            reply = ForwardMsg()
+            reply.ParseFromString(self._socket.recv(timeout=300))
+            kind = reply.WhichOneof("type")
+            if kind == "delta" and reply.delta.WhichOneof("type") == "new_element":
+                self._read_element(reply.delta.new_element, reply.delta.fragment_id)
+            elif kind == "auto_rerun":
+                self.auto_rerun = (reply.auto_rerun.interval, reply.auto_rerun.fragment_id)
+            elif kind == "script_finished" and reply.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                return
+
+    def _read_element(self, element, fragment_id):
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            self.errors += 1
+        elif kind == "alert":
+            self.texts.append(element.alert.body)
+            if element.alert.format == element.alert.ERROR:
+                self.errors += 1
+        elif kind == "markdown":
+            self.texts.append(element.markdown.body)
+        else:
+            widget = getattr(element, kind)
+            if hasattr(widget, "id") and hasattr(widget, "label"):
+                self.widgets[widget.label] = (widget.id, fragment_id)
+
+    def click(self, label):
+        self.rerun(trigger=label, fragment_id=self.widgets[label][1])
+
+    def type(self, label, text):
+        self.rerun([(label, "string_value", text)], fragment_id=self.widgets[label][1])
+
+    def showing(self, text):
+        return any(text in shown for shown in self.texts)
+
+
+def run_session(port, index, rounds, start, record):
+    with connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"], max_size=None,
+                 open_timeout=30) as websocket:
+        session = SimulatedSession(websocket)
+        session.rerun()
+        start.wait()
+
+        def timed(interaction, action):
+            errors = session.errors
+            began = perf_counter()
+            action()
+            record(interaction, perf_counter() - began, session.errors - errors)
+
+        # Saving the key reruns the app, which loads the first word
+        timed("first_word", lambda: session.rerun([("Enter your Gemini API Key:", "string_value",
+                                                     f"load-test-key-{index}")], trigger="Save API Key"))
+        for _ in range(rounds):
+            timed("next_word", lambda: session.click("Next Word"))
+            timed("show_answer", lambda: session.click("Show Answer"))
+            answer = next((match.group(1) for text in session.texts for match in [ANSWER_PATTERN.search(text)]
+                           if match), "")
+
+            def answer_and_wait():
+                session.type("Your translation:", answer)
+                # The card polls for a background-generated word, as the browser would
+                while session.showing("Loading the next word") and session.auto_rerun:
+                    interval, fragment_id = session.auto_rerun
+                    time.sleep(interval)
+                    session.rerun(fragment_id=fragment_id, is_auto_rerun=True)
+            timed("correct_answer", answer_and_wait)
+
+
+def run_load(port, sessions, rounds):
+    """Run ``sessions`` concurrent sessions; returns interaction -> latencies, error count and wall time"""
+    samples = defaultdict(list)
+    errors = [0]
+    failures = []
+    lock = threading.Lock()
+
+    def record(interaction, seconds, error_count):
+        with lock:
+            samples[interaction].append(seconds)
+            errors[0] += error_count
+
+    def session_thread(index):
+        try:
+            run_session(port, index, rounds, start, record)
+        except Exception as e:
+            failures.append(e)
+            start.abort()
+
+    start = threading.Barrier(sessions + 1)
+    threads = [threading.Thread(target=session_thread, args=(i,), daemon=True) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = perf_counter()
+    for thread in threads:
+        thread.join()
+    if failures:
+        raise failures[0]
+    return samples, errors[0], perf_counter() - began
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("sessions", nargs="*", type=int, default=SESSION_COUNTS)
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    parser.add_argument("--latency", type=float, default=0.5, help="stub seconds per Gemini response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of stub responses that are 503s")
+    parser.add_argument("--endpoint", help="use a running stub (or proxy) instead of starting one")
+    args = parser.parse_args()
+
+    stub = None
+    endpoint = args.endpoint
+    if endpoint is None:
+        stub, endpoint = start_stub(args.latency, args.error_rate)
+    app = None
+    try:
+        app, port = start_app(endpoint)
+        # Imports and first-use setup in the server would otherwise land in the first measurement
+        run_load(port, 1, 1)
+        print(f"{'sessions':>8} | {'interaction':<14} | {'count':>5} | {'per s':>6} | {'p50 (ms)':>8} | "
+              f"{'p99 (ms)':>8} | {'server CPU/op (ms)':>18} | errors")
+        for sessions in args.sessions:
+            cpu_before = cpu_seconds(app.pid)
+            samples, errors, wall = run_load(port, sessions, args.rounds)
+            cpu_after = cpu_seconds(app.pid)
+            total = sum(len(latencies) for latencies in samples.values())
+            for interaction in INTERACTIONS:
+                latencies = samples.get(interaction)
+                if latencies:
+                    print(f"{sessions:>8} | {interaction:<14} | {len(latencies):>5} | {len(latencies) / wall:>6.1f} | "
+                          f"{percentile(latencies, 50) * 1000:>8.0f} | {percentile(latencies, 99) * 1000:>8.0f} | "
+                          f"{'':>18} |")
+            cpu_per_op = (f"{(cpu_after - cpu_before) / total * 1000:>18.1f}" if cpu_before is not None
+                          else f"{'n/a':>18}")
+            print(f"{sessions:>8} | {'all':<14} | {total:>5} | {total / wall:>6.1f} | {'':>8} | {'':>8} | "
+                  f"{cpu_per_op} | {errors}")
+    finally:
+        for process in (app, stub):
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import os
+
 # Sample vocabulary data to start with
 DEFAULT_VOCAB = [
     {"german": "der Hund", "english": "dog", "article": "der", "category": "animals", "level": "A1"},
@@ -15,6 +17,9 @@ ARTICLE_COLORS = {
     "": "#0078D7"      # Default blue
 }
 
+# Fields of a word record, in display and storage order; every generated word must provide all of them
+WORD_FIELDS = ["german", "english", "article", "category", "level"]
+
 # Define CEFR levels and their descriptions
 CEFR_LEVELS = ["A1", "A2", "B1", "B2", "C1", "C2"]
 LEVEL_DESCRIPTIONS = {
@@ -57,4 +62,97 @@ German: [sentence]
 English: [translation]
 
 Make the sentences appropriate for a {level} level German learner.
-"""
\ No newline at end of file
+"""
+
+# Bundled word lists for the local word source: one CSV per CEFR level, most
+# frequent words first; DEFAULT_VOCAB is served before them
+LOCAL_WORD_LISTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "word_lists")
+
+# Number of generated words to keep ready for "Next Word" per filter combination
+PREFETCH_BUFFER_SIZE = 3
+
+# Background threads refilling the prefetch buffer
+PREFETCH_WORKERS = 2
+
+# Default and maximum number of words requested per batch generation call
+BATCH_SIZE = 10
+MAX_BATCH_SIZE = 50
+
+# Maximum number of existing words listed in a generation prompt
+EXCLUSION_PROMPT_LIMIT = 30
+
+# How often a duplicate word is re-requested before giving up
+MAX_DUPLICATE_RETRIES = 2
+
+# Example sentence cache: in-memory LRU capacity and on-disk SQLite file
+EXAMPLE_CACHE_SIZE = 512
+EXAMPLE_CACHE_PATH = os.environ.get("VOCAB_EXAMPLE_CACHE", os.path.join(".cache", "examples.sqlite3"))
+
+# Optional SQLite database persisting vocabulary, collections and score; disabled when unset
+VOCAB_DB_PATH = os.environ.get("VOCAB_DB_PATH")
+
+# Most recent generated words kept per (category, level) in the process-wide shared pool
+SHARED_POOL_SIZE = 500
+
+# Cache for Gemini generate_content calls: off, cache, record or replay. Word requests
+# bypass the in-memory cache, so only record and replay affect them
+LLM_CACHE_MODE = os.environ.get("VOCAB_LLM_CACHE_MODE", "cache")
+LLM_CACHE_TTL = 24 * 60 * 60
+LLM_CACHE_SIZE = 1024
+LLM_CACHE_RECORDING = os.environ.get("VOCAB_LLM_RECORDING", os.path.join(".cache", "llm_recording.jsonl"))
+
+# Optional Gemini API endpoint (a proxy or a local stand-in such as benchmarks/gemini_stub.py);
+# requests then use the REST transport, which also accepts plain http:// URLs
+GEMINI_API_ENDPOINT = os.environ.get("VOCAB_GEMINI_ENDPOINT")
+
+# Gemini request engine: shared worker pool, per-key rate limit, retries and circuit breaker
+REQUEST_WORKERS = 8
+GEMINI_REQUESTS_PER_MINUTE = 60
+GEMINI_BURST = 10
+MAX_RETRIES = 4
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 16.0
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_SECONDS = 30.0
+
+# Maximum number of batch generation calls run at once
+MAX_BATCH_PARALLEL = 8
+
+# Hedged word generation: race a second request when the first is slower than
+# the HEDGE_PERCENTILE of recent request latencies (HEDGE_DEFAULT_DELAY until
+# HEDGE_MIN_SAMPLES requests have been seen)
+HEDGE_PERCENTILE = 90
+HEDGE_MIN_SAMPLES = 20
+HEDGE_DEFAULT_DELAY = 3.0
+
+# Latency samples kept per recorder for percentile reporting
+LATENCY_WINDOW = 1000
+
+# Seconds between checks for a background-generated word after a correct answer
+NEXT_WORD_POLL_SECONDS = 0.5
+
+# Rows encoded at a time when exporting the vocabulary
+EXPORT_CHUNK_ROWS = 5000
+
+# Vocabulary table pagination: page size choices and styled pages kept per session
+TABLE_PAGE_SIZES = [50, 100, 250, 500]
+TABLE_PAGE_CACHE_SIZE = 16
+
+# Vocabulary search: results returned per query and minimum trigram (Dice) similarity for fuzzy matches
+SEARCH_RESULT_LIMIT = 200
+SEARCH_FUZZY_THRESHOLD = 0.4
+
+# Near-duplicate check: normalized German words at least this long also count as
+# duplicates of stored words within one edit that share their English translation
+# (typos like "Schmeterling"; "verkaufen"/"verlaufen" stay distinct)
+NEAR_DUPLICATE_MIN_LENGTH = 8
+
+# Instrumentation: histogram bucket upper bounds for latencies (seconds) and
+# prompt/response sizes (characters)
+METRICS_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRICS_SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536)
+
+# Optional metrics dump for dashboards, written at most every METRICS_DUMP_SECONDS:
+# Prometheus text if the path ends in .prom, otherwise appended JSON lines
+METRICS_DUMP_PATH = os.environ.get("VOCAB_METRICS_PATH")
+METRICS_DUMP_SECONDS = 60.0
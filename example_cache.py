@@ -0,0 +1,83 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from config import EXAMPLE_CACHE_PATH, EXAMPLE_CACHE_SIZE
+
+
+class ExampleCache:
+    """Two-tier cache for generated example sentences.
+
+    A bounded in-memory LRU sits in front of an SQLite file, so entries survive
+    restarts and are shared by every session in the process. Pass ``path=None``
+    to keep the cache in memory only.
+    """
+
+    def __init__(self, path=EXAMPLE_CACHE_PATH, max_entries=EXAMPLE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._db = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS examples ("
+                "german TEXT NOT NULL, level TEXT NOT NULL, version INTEGER NOT NULL, "
+                "text TEXT NOT NULL, PRIMARY KEY (german, level, version))"
+            )
+            self._db.commit()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Look up ``(german, level, version)``; returns the text or None"""
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return text
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT text FROM examples WHERE german = ? AND level = ? AND version = ?", key
+                ).fetchone()
+                if row is not None:
+                    self.disk_hits += 1
+                    self._remember(key, row[0])
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, key, text):
+        """Store text in memory and on disk"""
+        with self._lock:
+            self._remember(key, text)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO examples VALUES (?, ?, ?, ?)", (*key, text))
+                self._db.commit()
+
+    def _remember(self, key, text):
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        """Hit rate, size and eviction counters for display"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+
+from config import EXPORT_CHUNK_ROWS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+
+def _chunks(rows, size):
+    """Group an iterable of rows into lists of at most ``size``"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_csv(rows, columns, out, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write rows as UTF-8 CSV with a header, one chunk at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    for chunk in _chunks(rows, chunk_rows):
+        writer.writerows(chunk)
+        out.write(buffer.getvalue().encode("utf-8"))
+        buffer.seek(0)
+        buffer.truncate()
+    out.write(buffer.getvalue().encode("utf-8"))
+
+
+def write_jsonl(rows, columns, out, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write rows as one JSON object per line, one chunk at a time"""
+    for chunk in _chunks(rows, chunk_rows):
+        out.write("".join(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in chunk
+        ).encode("utf-8"))
+
+
+def write_parquet(rows, columns, out, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write rows as a Parquet file with one row group per chunk"""
+    schema = pa.schema([(column, pa.string()) for column in columns])
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in _chunks(rows, chunk_rows):
+            writer.write_table(pa.Table.from_pylist([dict(zip(columns, row)) for row in chunk], schema=schema))
+
+
+# Format name -> (writer, file extension, MIME type)
+EXPORT_FORMATS = {
+    "CSV": (write_csv, "csv", "text/csv"),
+    "JSONL": (write_jsonl, "jsonl", "application/x-ndjson"),
+}
+if pq is not None:
+    EXPORT_FORMATS["Parquet"] = (write_parquet, "parquet", "application/vnd.apache.parquet")
+
+
+def export_bytes(export_format, rows, columns):
+    """Encode rows in ``export_format`` and return the file contents"""
+    writer = EXPORT_FORMATS[export_format][0]
+    out = io.BytesIO()
+    writer(rows, columns, out)
+    return out.getvalue()
@@ -0,0 +1,57 @@
+from array import array
+from operator import attrgetter
+
+import pandas as pd
+
+from config import WORD_FIELDS
+from word_table import shared_table
+
+HISTORY_COLUMNS = list(WORD_FIELDS)
+
+
+class HistoryStore:
+    """Append buffer behind the vocabulary history table.
+
+    Records are interned in a ``WordTable`` and only their IDs are kept, so
+    appends are amortized O(1) array appends. ``to_dataframe`` builds the
+    DataFrame on demand and reuses it until the next mutation. Treat the
+    returned frame as read-only. ``columns`` are two or more word fields.
+    """
+
+    def __init__(self, records=(), columns=HISTORY_COLUMNS, table=None):
+        self.columns = list(columns)
+        self.table = shared_table if table is None else table
+        self._ids = array("I")
+        self.table.hold(self, self._ids)
+        self._row = attrgetter(*self.columns)
+        self._frame = None
+        self.version = 0
+        self.extend(records)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def append(self, record):
+        """Add one word record"""
+        self.extend([record])
+
+    def extend(self, records):
+        """Add several word records with a single invalidation"""
+        added = False
+        for record in records:
+            self._ids.append(self.table.add(record))
+            added = True
+        if added:
+            self._frame = None
+            self.version += 1
+
+    def rows(self):
+        """Iterate the history as tuples in ``columns`` order without building a DataFrame"""
+        table = self.table
+        return (self._row(table[word_id]) for word_id in self._ids)
+
+    def to_dataframe(self):
+        """Materialize the history as a DataFrame, cached until the next mutation"""
+        if self._frame is None:
+            self._frame = pd.DataFrame.from_records(list(self.rows()), columns=self.columns)
+        return self._frame
@@ -0,0 +1,37 @@
+import threading
+from collections import deque
+
+from config import LATENCY_WINDOW
+
+
+class LatencyRecorder:
+    """Rolling window of latency samples (seconds) with percentile lookups"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._samples)
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percent):
+        """Nearest-rank percentile of the window, or None without samples"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(1, -(-len(samples) * percent // 100))
+        return samples[int(rank) - 1]
+
+    def summary(self):
+        """Sample count and p50/p95/p99 for display"""
+        return {
+            "count": len(self),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
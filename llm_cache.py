@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from config import LLM_CACHE_MODE, LLM_CACHE_RECORDING, LLM_CACHE_SIZE, LLM_CACHE_TTL
+
+USAGE_FIELDS = ["prompt_token_count", "candidates_token_count", "total_token_count"]
+
+
+class ReplayMissError(RuntimeError):
+    """Raised in replay mode when a prompt has no recorded response"""
+
+
+class CachedResponse:
+    """Minimal stand-in for a Gemini response: ``text`` and ``usage_metadata``"""
+
+    def __init__(self, text, usage=None):
+        self.text = text
+        self.usage_metadata = SimpleNamespace(**{field: (usage or {}).get(field, 0) for field in USAGE_FIELDS})
+
+
+class ResponseCache:
+    """Content-addressed response cache with TTL, size cap and record/replay.
+
+    Modes:
+    - ``off``: every call goes to the model
+    - ``cache``: responses are kept in memory for ``ttl`` seconds
+    - ``record``: like ``cache``, and every live response is appended to ``recording_path``
+    - ``replay``: responses come only from ``recording_path``; misses raise ReplayMissError
+
+    ``CachingModel.generate_fresh`` calls (word requests) never read the
+    in-memory cache, so a duplicate or unparseable word is not replayed.
+    """
+
+    def __init__(self, mode=LLM_CACHE_MODE, ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_SIZE,
+                 recording_path=LLM_CACHE_RECORDING):
+        self.mode = mode
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.recording_path = recording_path
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if mode in ("record", "replay") and os.path.exists(recording_path):
+            with open(recording_path, encoding="utf-8") as recording:
+                for line in recording:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = (float("inf"), entry["text"], entry.get("usage"))
+
+    @staticmethod
+    def make_key(model_name, prompt, settings):
+        """Hash of everything that determines the response"""
+        payload = json.dumps([model_name, prompt, settings], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return a CachedResponse or None; expired entries are dropped"""
+        if self.mode == "off":
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.mode == "replay" or entry[0] > time.monotonic()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return CachedResponse(entry[1], entry[2])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+        if self.mode == "replay":
+            raise ReplayMissError("No recorded response for this prompt")
+        return None
+
+    def put(self, key, text, usage=None):
+        """Store a live response"""
+        if self.mode in ("off", "replay"):
+            return
+        with self._lock:
+            expires = float("inf") if self.mode == "record" else time.monotonic() + self.ttl
+            self._entries[key] = (expires, text, usage)
+            self._entries.move_to_end(key)
+            # Recorded responses are never evicted so a full session can be replayed
+            while self.mode != "record" and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            if self.mode == "record":
+                directory = os.path.dirname(self.recording_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.recording_path, "a", encoding="utf-8") as recording:
+                    recording.write(json.dumps({"key": key, "text": text, "usage": usage}) + "\n")
+
+    def stats(self):
+        """Mode, size and hit/miss/eviction counters for display"""
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class CachingModel:
+    """Wrap a ``GenerativeModel`` so ``generate_content`` goes through a ResponseCache.
+
+    Everything else is delegated to the wrapped model, so call sites are unchanged.
+    """
+
+    def __init__(self, model, cache):
+        self._model = model
+        self._cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+    def generate_content(self, prompt, **kwargs):
+        return self._generate(prompt, kwargs, reuse=True)
+
+    def generate_fresh(self, prompt, **kwargs):
+        """Like ``generate_content``, but never answered from the in-memory cache.
+
+        For prompts that should get a new answer on every call, such as word
+        requests, where a reused response is a wasted duplicate. Responses are
+        still recorded in ``record`` mode and served in ``replay`` mode.
+        """
+        if self._cache.mode in ("off", "cache"):
+            return self._model.generate_content(prompt, **kwargs)
+        return self._generate(prompt, kwargs, reuse=self._cache.mode == "replay")
+
+    def _generate(self, prompt, kwargs, reuse):
+        settings = {
+            "generation_config": getattr(self._model, "_generation_config", None),
+            **{name: value for name, value in kwargs.items() if name != "stream"},
+        }
+        key = ResponseCache.make_key(getattr(self._model, "model_name", ""), prompt, settings)
+        cached = self._cache.get(key) if reuse else None
+        if cached is not None:
+            return [cached] if kwargs.get("stream") else cached
+
+        response = self._model.generate_content(prompt, **kwargs)
+        if kwargs.get("stream"):
+            return self._record_stream(key, response)
+        usage = getattr(response, "usage_metadata", None)
+        self._cache.put(key, response.text, {field: getattr(usage, field, 0) for field in USAGE_FIELDS})
+        return response
+
+    def _record_stream(self, key, response):
+        """Pass stream chunks through, caching the full text once the stream completes"""
+        parts = []
+        usage = None
+        for chunk in response:
+            parts.append(chunk.text)
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            yield chunk
+        self._cache.put(key, "".join(parts), {field: getattr(usage, field, 0) for field in USAGE_FIELDS})
+
+
+def generate_fresh(model, prompt, **kwargs):
+    """Call ``model.generate_fresh`` on a CachingModel, plain ``generate_content`` on any other model"""
+    fresh = getattr(model, "generate_fresh", None)
+    return fresh(prompt, **kwargs) if fresh is not None else model.generate_content(prompt, **kwargs)
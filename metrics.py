@@ -0,0 +1,233 @@
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+
+from config import METRICS_DUMP_PATH, METRICS_DUMP_SECONDS, METRICS_LATENCY_BUCKETS, METRICS_SIZE_BUCKETS
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus style: upper bounds, plus a +Inf bucket)"""
+
+    def __init__(self, bounds=METRICS_LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """(upper bound, observations <= bound) pairs, ending with +Inf"""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.bounds + (math.inf,), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def quantile(self, q):
+        """Estimate a quantile by interpolating inside its bucket, or None without samples"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        lower = 0.0
+        seen = 0
+        for bound, count in zip(self.bounds + (math.inf,), self.counts):
+            if count and seen + count >= rank:
+                if math.isinf(bound):
+                    return lower
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return lower
+
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_bound(bound):
+    return "+Inf" if math.isinf(bound) else repr(float(bound))
+
+
+def _prometheus_labels(labels, extra=()):
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Metrics:
+    """Process-wide counters and histograms, keyed by name and labels.
+
+    ``time`` and ``observe`` feed histograms, ``inc`` feeds counters. All
+    methods are thread-safe, so worker threads can record Gemini calls.
+    ``to_jsonl`` and ``to_prometheus`` render a snapshot for dashboards;
+    ``maybe_dump`` writes one to ``dump_path`` at most every ``dump_seconds``.
+    """
+
+    def __init__(self, dump_path=METRICS_DUMP_PATH, dump_seconds=METRICS_DUMP_SECONDS):
+        self.dump_path = dump_path
+        self.dump_seconds = dump_seconds
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._last_dump = time.monotonic()
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, buckets=METRICS_LATENCY_BUCKETS, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def time(self, name, **labels):
+        """Observe the seconds spent in the ``with`` block, even if it raises"""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - start, **labels)
+
+    def histogram(self, name, **labels):
+        """Copy of one histogram, or None if nothing was observed"""
+        with self._lock:
+            histogram = self._histograms.get((name, _label_key(labels)))
+            if histogram is None:
+                return None
+            copy = Histogram(histogram.bounds)
+            copy.counts, copy.sum, copy.count = list(histogram.counts), histogram.sum, histogram.count
+            return copy
+
+    def snapshot(self):
+        """All series as plain dicts, sorted by name and labels"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = [(key, histogram.cumulative(), histogram.sum, histogram.count)
+                          for key, histogram in sorted(self._histograms.items(), key=lambda item: item[0])]
+        series = [{"type": "counter", "name": name, "labels": dict(labels), "value": value}
+                  for (name, labels), value in counters]
+        for (name, labels), buckets, total, count in histograms:
+            series.append({"type": "histogram", "name": name, "labels": dict(labels), "count": count,
+                           "sum": total, "buckets": {_format_bound(bound): seen for bound, seen in buckets}})
+        return series
+
+    def to_jsonl(self):
+        """One JSON object per series, stamped with the current Unix time"""
+        timestamp = time.time()
+        return "".join(json.dumps({"ts": timestamp, **series}) + "\n" for series in self.snapshot())
+
+    def to_prometheus(self):
+        """Prometheus text exposition format"""
+        lines = []
+        typed = set()
+        for series in self.snapshot():
+            name = series["name"]
+            labels = sorted(series["labels"].items())
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {series['type']}")
+            if series["type"] == "counter":
+                lines.append(f"{name}{_prometheus_labels(labels)} {series['value']}")
+                continue
+            for bound, seen in series["buckets"].items():
+                lines.append(f"{name}_bucket{_prometheus_labels(labels, [('le', bound)])} {seen}")
+            lines.append(f"{name}_sum{_prometheus_labels(labels)} {series['sum']}")
+            lines.append(f"{name}_count{_prometheus_labels(labels)} {series['count']}")
+        return "\n".join(lines) + "\n"
+
+    def maybe_dump(self):
+        """Write a snapshot to ``dump_path`` if one is configured and the interval has passed.
+
+        A ``.prom`` path is rewritten with Prometheus text (for a textfile
+        collector); any other path gets JSON lines appended.
+        """
+        if not self.dump_path:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_dump < self.dump_seconds:
+                return
+            self._last_dump = now
+        directory = os.path.dirname(self.dump_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.dump_path.endswith(".prom"):
+            # Write then rename so a scraper never reads a half-written file
+            partial = f"{self.dump_path}.{os.getpid()}.tmp"
+            with open(partial, "w", encoding="utf-8") as out:
+                out.write(self.to_prometheus())
+            os.replace(partial, self.dump_path)
+        else:
+            with open(self.dump_path, "a", encoding="utf-8") as out:
+                out.write(self.to_jsonl())
+
+
+class MeteredModel:
+    """Wrap a ``GenerativeModel`` to record each ``generate_content`` call in a Metrics registry.
+
+    Records latency, prompt and response size in characters, and the outcome:
+    ``ok``, ``empty`` (no text, e.g. a blocked response) or the exception's class name.
+    Streamed calls are measured until the stream is exhausted.
+    """
+
+    def __init__(self, model, metrics):
+        self._model = model
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+    def generate_content(self, prompt, **kwargs):
+        stream = bool(kwargs.get("stream"))
+        start = perf_counter()
+        try:
+            response = self._model.generate_content(prompt, **kwargs)
+        except Exception as e:
+            self._record(prompt, stream, start, type(e).__name__, 0)
+            raise
+        if stream:
+            return self._metered_stream(prompt, response, start)
+        try:
+            text = response.text
+        except (ValueError, AttributeError):
+            text = None
+        self._record(prompt, stream, start, "ok" if text else "empty", len(text or ""))
+        return response
+
+    def _metered_stream(self, prompt, response, start):
+        size = 0
+        outcome = None
+        try:
+            for chunk in response:
+                size += len(getattr(chunk, "text", "") or "")
+                yield chunk
+        except Exception as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            # Also reached when the caller stops reading early
+            self._record(prompt, True, start, outcome or ("ok" if size else "empty"), size)
+
+    def _record(self, prompt, stream, start, outcome, response_chars):
+        kind = "stream" if stream else "single"
+        self._metrics.observe("gemini_request_seconds", perf_counter() - start, kind=kind, outcome=outcome)
+        self._metrics.inc("gemini_requests_total", kind=kind, outcome=outcome)
+        self._metrics.observe("gemini_prompt_chars", len(str(prompt)), buckets=METRICS_SIZE_BUCKETS, kind=kind)
+        self._metrics.observe("gemini_response_chars", response_chars, buckets=METRICS_SIZE_BUCKETS, kind=kind)
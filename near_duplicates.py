@@ -0,0 +1,97 @@
+from config import NEAR_DUPLICATE_MIN_LENGTH
+
+GERMAN_ARTICLES = ("der", "die", "das")
+
+# Umlauts fold to their two-letter spellings ("Tür" = "Tuer", but "Bar" != "Bär"); casefold() turns ß into ss
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue"})
+
+
+def normalize_german(german):
+    """Duplicate-check form of a German word: no leading article, casefolded, umlauts and ß folded"""
+    tokens = german.casefold().split()
+    if len(tokens) > 1 and tokens[0] in GERMAN_ARTICLES:
+        tokens = tokens[1:]
+    return " ".join(tokens).translate(_UMLAUTS)
+
+
+def within_one_edit(a, b):
+    """True if a and b differ by at most one insertion, deletion or substitution"""
+    if len(a) > len(b):
+        a, b = b, a
+    if len(b) - len(a) > 1:
+        return False
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:]
+    return a[i:] == b[i + 1:]
+
+
+def _deletions(key):
+    """``key`` and every copy of it with one character deleted"""
+    yield key
+    for i in range(len(key)):
+        yield key[:i] + key[i + 1:]
+
+
+class NearDuplicateIndex:
+    """Find stored keys within edit distance 1 of a new key.
+
+    Only keys of at least ``min_length`` characters take part; shorter words
+    differ by one letter too often ("Hand"/"Hund") to treat as typos. Each key
+    is filed under itself and under every one-character deletion of it. Two
+    keys within one edit share one of those forms, so a lookup is
+    ``len(key) + 1`` dict probes, however many stored keys share a prefix.
+    Entries are filed by the form's hash; collisions only add candidates
+    that the final edit-distance check drops.
+    """
+
+    def __init__(self, min_length=NEAR_DUPLICATE_MIN_LENGTH):
+        self.min_length = min_length
+        # hash(form) -> stored key, or a tuple of stored keys when several share the form
+        self._forms = {}
+
+    def add(self, key):
+        """Index a normalized key"""
+        if len(key) < self.min_length:
+            return
+        forms = self._forms
+        for form in set(map(hash, _deletions(key))):
+            keys = forms.get(form)
+            if keys is None:
+                forms[form] = key
+            elif isinstance(keys, tuple):
+                forms[form] = keys + (key,)
+            else:
+                forms[form] = (keys, key)
+
+    def discard(self, key):
+        """Remove a key added earlier, if present"""
+        if len(key) < self.min_length:
+            return
+        forms = self._forms
+        for form in set(map(hash, _deletions(key))):
+            keys = forms.get(form)
+            if keys == key:
+                del forms[form]
+            elif isinstance(keys, tuple) and key in keys:
+                remaining = tuple(other for other in keys if other != key)
+                forms[form] = remaining if len(remaining) > 1 else remaining[0]
+
+    def candidates(self, key):
+        """Yield the stored keys within one edit of ``key`` (other than ``key`` itself), each once"""
+        if len(key) < self.min_length:
+            return
+        seen = {key}
+        for form in _deletions(key):
+            keys = self._forms.get(hash(form), ())
+            for candidate in (keys,) if isinstance(keys, str) else keys:
+                if candidate not in seen:
+                    seen.add(candidate)
+                    if within_one_edit(key, candidate):
+                        yield candidate
+
+    def find(self, key):
+        """Return a stored key within one edit of ``key`` (other than ``key`` itself), or None"""
+        return next(self.candidates(key), None)
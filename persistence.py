@@ -0,0 +1,119 @@
+import os
+import sqlite3
+import threading
+
+from config import WORD_FIELDS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    deck_id TEXT PRIMARY KEY,
+    score INTEGER NOT NULL DEFAULT 0,
+    total_attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    deck_id TEXT NOT NULL,
+    german TEXT NOT NULL,
+    english TEXT NOT NULL,
+    article TEXT NOT NULL DEFAULT '',
+    category TEXT NOT NULL DEFAULT '',
+    level TEXT NOT NULL DEFAULT '',
+    UNIQUE (deck_id, german)
+);
+CREATE INDEX IF NOT EXISTS idx_words_category ON words (deck_id, category);
+CREATE INDEX IF NOT EXISTS idx_words_level ON words (deck_id, level);
+CREATE TABLE IF NOT EXISTS collections (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    deck_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE (deck_id, name)
+);
+CREATE TABLE IF NOT EXISTS collection_words (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    deck_id TEXT NOT NULL,
+    collection TEXT NOT NULL,
+    german TEXT NOT NULL,
+    UNIQUE (deck_id, collection, german)
+);
+"""
+
+
+class VocabularyDatabase:
+    """Embedded SQLite store for decks, their words, collections and score.
+
+    Each browser session is a deck identified by ``deck_id``. Writes are
+    incremental: one statement per changed word, collection or score. The
+    connection is shared across sessions and guarded by a lock.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+
+    def _write(self, sql, rows):
+        with self._lock:
+            self._db.executemany(sql, rows)
+            self._db.commit()
+
+    def _read(self, sql, params):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def load_words(self, deck_id):
+        """All words of a deck in insertion order"""
+        rows = self._read(
+            f"SELECT {', '.join(WORD_FIELDS)} FROM words WHERE deck_id = ? ORDER BY id", (deck_id,)
+        )
+        return [dict(zip(WORD_FIELDS, row)) for row in rows]
+
+    def add_words(self, deck_id, words):
+        """Insert new words; words already stored for the deck are ignored"""
+        self._write(
+            f"INSERT OR IGNORE INTO words (deck_id, {', '.join(WORD_FIELDS)}) VALUES (?, ?, ?, ?, ?, ?)",
+            [(deck_id, *(word.get(column, "") or "" for column in WORD_FIELDS)) for word in words],
+        )
+
+    def load_collections(self, deck_id, words_by_german):
+        """Saved collections of a deck as {name: [word, ...]}, resolved against ``words_by_german``"""
+        collections = {name: [] for (name,) in self._read(
+            "SELECT name FROM collections WHERE deck_id = ? ORDER BY id", (deck_id,)
+        )}
+        for collection, german in self._read(
+            "SELECT collection, german FROM collection_words WHERE deck_id = ? ORDER BY id", (deck_id,)
+        ):
+            word = words_by_german(german)
+            if word is not None:
+                collections.setdefault(collection, []).append(word)
+        return collections
+
+    def add_collection(self, deck_id, name):
+        """Create an empty collection"""
+        self._write("INSERT OR IGNORE INTO collections (deck_id, name) VALUES (?, ?)", [(deck_id, name)])
+
+    def add_collection_word(self, deck_id, name, word):
+        """Add a word to a collection"""
+        self.add_collection(deck_id, name)
+        self._write(
+            "INSERT OR IGNORE INTO collection_words (deck_id, collection, german) VALUES (?, ?, ?)",
+            [(deck_id, name, word["german"])],
+        )
+
+    def load_score(self, deck_id):
+        """Return (score, total_attempts) for a deck"""
+        rows = self._read("SELECT score, total_attempts FROM decks WHERE deck_id = ?", (deck_id,))
+        return rows[0] if rows else (0, 0)
+
+    def save_score(self, deck_id, score, total_attempts):
+        """Store the deck's score counters"""
+        self._write(
+            "INSERT INTO decks (deck_id, score, total_attempts) VALUES (?, ?, ?) "
+            "ON CONFLICT (deck_id) DO UPDATE SET score = excluded.score, total_attempts = excluded.total_attempts",
+            [(deck_id, score, total_attempts)],
+        )
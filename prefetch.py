@@ -0,0 +1,107 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from config import PREFETCH_BUFFER_SIZE, PREFETCH_WORKERS
+
+
+class WordPrefetcher:
+    """Keep a small buffer of generated words ready for the current filters.
+
+    ``produce`` is called from background threads as
+    ``produce(category, level, existing_words)`` and must not touch
+    ``st.session_state``; it returns a word dict or None. Work runs on
+    ``executor`` (anything with ``submit``) when given, otherwise on a
+    private thread pool.
+    """
+
+    def __init__(self, produce, buffer_size=PREFETCH_BUFFER_SIZE, max_workers=PREFETCH_WORKERS, executor=None):
+        self._produce = produce
+        self.buffer_size = buffer_size
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="word-prefetch")
+        self._lock = threading.Lock()
+        self._buffer = deque()
+        self._filters = None
+        self._generation = 0
+        self._in_flight = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def _set_filters(self, category, level):
+        """Drop buffered words when the filter combination changes"""
+        filters = (category, level)
+        if filters != self._filters:
+            self.stale += len(self._buffer)
+            self._buffer.clear()
+            self._filters = filters
+            self._generation += 1
+
+    def pop(self, category, level, known_words, existing_words=()):
+        """Return a buffered word not in ``known_words``, or None on a miss.
+
+        ``known_words`` only needs to support ``in``; ``existing_words`` is
+        the bounded list passed on to the prompt when refilling.
+        """
+        word = None
+        with self._lock:
+            self._set_filters(category, level)
+            while self._buffer:
+                candidate = self._buffer.popleft()
+                if candidate["german"] not in known_words:
+                    word = candidate
+                    break
+                self.stale += 1
+            if word is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        self.fill(category, level, existing_words)
+        return word
+
+    def fill(self, category, level, existing_words=()):
+        """Schedule background generation until the buffer is full"""
+        with self._lock:
+            self._set_filters(category, level)
+            missing = self.buffer_size - len(self._buffer) - self._in_flight
+            if missing <= 0:
+                return
+            # Ordered, so the prompt (and its recorded response) is the same on every run
+            exclude = list(dict.fromkeys([*existing_words, *(word["german"] for word in self._buffer)]))
+            generation = self._generation
+            self._in_flight += missing
+        for _ in range(missing):
+            self._executor.submit(self._work, generation, category, level, exclude)
+
+    def _work(self, generation, category, level, exclude):
+        try:
+            word = self._produce(category, level, exclude)
+        except Exception:
+            word = None
+        with self._lock:
+            self._in_flight -= 1
+            if word is None or generation != self._generation:
+                return
+            if word["german"] in exclude or any(w["german"] == word["german"] for w in self._buffer):
+                return
+            self._buffer.append(word)
+
+    def stats(self):
+        """Buffer size and hit/miss counters for display"""
+        with self._lock:
+            return {
+                "buffered": len(self._buffer),
+                "in_flight": self._in_flight,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+            }
+
+    def close(self):
+        """Stop accepting work; pending requests are abandoned"""
+        with self._lock:
+            self._generation += 1
+            self._buffer.clear()
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,233 @@
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from config import (
+    BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS, GEMINI_BURST, GEMINI_REQUESTS_PER_MINUTE,
+    MAX_RETRIES, REQUEST_WORKERS, RETRY_BASE_DELAY, RETRY_MAX_DELAY,
+)
+
+try:
+    from google.api_core import exceptions as api_exceptions
+    TRANSIENT_ERRORS = (
+        api_exceptions.TooManyRequests,
+        api_exceptions.ResourceExhausted,
+        api_exceptions.InternalServerError,
+        api_exceptions.ServiceUnavailable,
+        api_exceptions.DeadlineExceeded,
+        ConnectionError,
+        TimeoutError,
+    )
+except ImportError:
+    TRANSIENT_ERRORS = (ConnectionError, TimeoutError)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the API while the circuit breaker is open"""
+
+
+class TokenBucket:
+    """Blocking token bucket: ``rate_per_minute`` sustained, ``capacity`` burst"""
+
+    def __init__(self, rate_per_minute=GEMINI_REQUESTS_PER_MINUTE, capacity=GEMINI_BURST):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Take one token, sleeping until one is available"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def available(self):
+        """Tokens currently available"""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class CircuitBreaker:
+    """Stop calling the API after repeated transient failures.
+
+    After ``failure_threshold`` consecutive failures the breaker opens for
+    ``reset_seconds``; then one trial call is let through (half-open) and its
+    outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_seconds=BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half-open"
+            return "open"
+
+    def allow(self):
+        """Raise CircuitOpenError unless a call may go through"""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self.reset_seconds - (time.monotonic() - self._opened_at)
+            if remaining <= 0 and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            raise CircuitOpenError(f"Gemini API unavailable, retrying in {max(remaining, 0):.0f}s")
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class RequestEngine:
+    """Run Gemini calls concurrently under one rate limit and circuit breaker.
+
+    ``submit`` schedules a job on the worker pool; ``call`` runs a single API
+    call in the current thread through the limiter, retries and breaker.
+    Jobs submitted to the pool should make their API calls through ``call``.
+    """
+
+    def __init__(self, max_workers=REQUEST_WORKERS, bucket=None, breaker=None,
+                 max_retries=MAX_RETRIES, base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY):
+        self.bucket = bucket or TokenBucket()
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gemini-request")
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def submit(self, fn, *args, **kwargs):
+        """Schedule ``fn`` on the worker pool and return its Future"""
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def hedged(self, fn, is_valid, hedge_after, max_attempts=2):
+        """Run ``fn`` on the pool, racing another copy if no valid result arrives in time.
+
+        A new attempt is launched whenever ``hedge_after`` seconds pass without
+        a valid result, or an attempt finishes with an invalid one. The first
+        valid result wins and the remaining attempts are cancelled or ignored.
+        Without a valid result, the last result is returned, or the last error
+        is raised if every attempt failed.
+        """
+        first = self.submit(fn)
+        pending = {first}
+        launched = 1
+        fallback, error = None, None
+        while pending:
+            timeout = hedge_after if launched < max_attempts else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if is_valid(result):
+                    for other in pending:
+                        other.cancel()
+                    if future is not first:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return result
+                fallback = result
+            if launched < max_attempts:
+                pending.add(self.submit(fn))
+                launched += 1
+                with self._lock:
+                    self.hedges += 1
+        if fallback is None and error is not None:
+            raise error
+        return fallback
+
+    def call(self, fn, *args, **kwargs):
+        """Call ``fn`` with rate limiting, jittered exponential backoff and the circuit breaker"""
+        attempt = 0
+        while True:
+            self.breaker.allow()
+            self.bucket.acquire()
+            with self._lock:
+                self.calls += 1
+            try:
+                result = fn(*args, **kwargs)
+            except TRANSIENT_ERRORS:
+                self.breaker.record_failure()
+                with self._lock:
+                    self.failures += 1
+                if attempt >= self.max_retries:
+                    raise
+                # Full jitter keeps concurrent retries from hitting the API in lockstep
+                time.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+                continue
+            except Exception:
+                # The API answered, it just rejected this request
+                self.breaker.record_success()
+                raise
+            self.breaker.record_success()
+            return result
+
+    def stats(self):
+        """Call, retry and failure counters plus limiter/breaker state for display"""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "failures": self.failures,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "tokens": self.bucket.available(),
+                "breaker": self.breaker.state,
+            }
+
+
+class RateLimitedModel:
+    """Wrap a ``GenerativeModel`` so every ``generate_content`` goes through a RequestEngine"""
+
+    def __init__(self, model, engine):
+        self._model = model
+        self._engine = engine
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+    def generate_content(self, prompt, **kwargs):
+        return self._engine.call(self._model.generate_content, prompt, **kwargs)
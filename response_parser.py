@@ -0,0 +1,191 @@
+import json
+import re
+from typing import NamedTuple, TypedDict
+
+from config import CEFR_LEVELS, WORD_FIELDS
+
+CEFR_LEVEL_SET = frozenset(CEFR_LEVELS)
+
+ARTICLES = frozenset(("der", "die", "das", ""))
+
+# Longest excerpt of a rejected object kept for display and debugging
+FRAGMENT_LENGTH = 80
+
+_FENCE_OPEN = re.compile(r"```[A-Za-z]*")
+# Inside an object the only characters that matter are braces and string literals;
+# an unterminated string matches up to the end of the text
+_OBJECT_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*(")?|[{}]', re.DOTALL)
+# An object that is an array element or property value, e.g. a word inside a wrapper
+_NESTED_OBJECT = re.compile(r'[\[,:]\s*(\{)\s*"')
+
+_decoder = json.JSONDecoder()
+
+
+class WordRecord(TypedDict):
+    """A validated generated word"""
+    german: str
+    english: str
+    article: str
+    category: str
+    level: str
+
+
+class Rejection(NamedTuple):
+    """Why part of a response was not turned into a word.
+
+    ``reason`` is one of ``no_json``, ``invalid_json``, ``unterminated``,
+    ``not_an_object``, ``missing_keys``, ``wrong_type``, ``empty_value``,
+    ``invalid_level`` or ``invalid_article``.
+    """
+    reason: str
+    detail: str
+    fragment: str
+
+
+class ParseResult(NamedTuple):
+    """Words parsed from one response and the rejected fragments"""
+    words: list[WordRecord]
+    rejections: list[Rejection]
+
+
+def _fragment(value):
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+    return text if len(text) <= FRAGMENT_LENGTH else text[:FRAGMENT_LENGTH - 3] + "..."
+
+
+def _fenced_body(text):
+    """Contents of the first code fence in ``text``, or None"""
+    start = text.find("```")
+    if start == -1:
+        return None
+    body_start = _FENCE_OPEN.match(text, start).end()
+    end = text.find("```", body_start)
+    return text[body_start:end] if end != -1 else text[body_start:]
+
+
+def _object_end(text, start):
+    """Index just past the object opening at ``start``, or None if it never closes"""
+    depth = 0
+    for match in _OBJECT_TOKEN.finditer(text, start):
+        token = match.group(0)
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+            if depth == 0:
+                return match.end()
+        elif match.group(1) is None:
+            # Unterminated string literal
+            return None
+    return None
+
+
+def _scan_objects(text, rejections):
+    """Yield every top-level JSON object in ``text`` in a single left-to-right pass.
+
+    Intact objects nested inside a malformed one (e.g. words in a wrapper
+    with a trailing comma) are still yielded.
+    """
+    position = text.find("{")
+    malformed_end = -1
+    while position != -1:
+        try:
+            value, end = _decoder.raw_decode(text, position)
+        except json.JSONDecodeError as e:
+            if position >= malformed_end:
+                malformed_end = _object_end(text, position)
+                if malformed_end is None:
+                    malformed_end = len(text)
+                    rejections.append(Rejection("unterminated", "object is never closed", _fragment(text[position:])))
+                else:
+                    rejections.append(Rejection("invalid_json", e.msg, _fragment(text[position:malformed_end])))
+            end = position + 1
+        else:
+            yield value
+        if end < malformed_end:
+            # Only retry at nested objects so a malformed span is scanned in linear time
+            nested = _NESTED_OBJECT.search(text, end, malformed_end)
+            if nested:
+                position = nested.start(1)
+                continue
+            end = malformed_end
+        position = text.find("{", end)
+
+
+def _entries(value):
+    """Flatten a decoded value into candidate word entries"""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict) and not any(key in value for key in WORD_FIELDS):
+        # Wrapper objects like {"words": [...]}
+        nested = [item for item in value.values() if isinstance(item, (list, dict))]
+        if len(nested) == 1:
+            return _entries(nested[0])
+    return [value]
+
+
+def validate_word(entry, default_level=None) -> tuple[WordRecord | None, Rejection | None]:
+    """Return (WordRecord, None) for a valid entry or (None, Rejection)"""
+    if not isinstance(entry, dict):
+        return None, Rejection("not_an_object", type(entry).__name__, _fragment(entry))
+    german = entry.get("german")
+    english = entry.get("english")
+    article = entry.get("article")
+    category = entry.get("category")
+    level = entry.get("level")
+    if article is None:
+        article = ""
+    if default_level and (level is None or level == ""):
+        level = default_level
+    values = (german, english, article, category, level)
+
+    if None in values:
+        missing = [key for key, value in zip(WORD_FIELDS, values) if value is None]
+        return None, Rejection("missing_keys", ", ".join(missing), _fragment(entry))
+    if not (type(german) is type(english) is type(article) is type(category) is type(level) is str):
+        wrong_type = [key for key, value in zip(WORD_FIELDS, values) if not isinstance(value, str)]
+        return None, Rejection("wrong_type", ", ".join(wrong_type), _fragment(entry))
+
+    word = WordRecord(
+        german=" ".join(german.split()),
+        english=" ".join(english.split()),
+        article=article.strip().lower(),
+        category=" ".join(category.split()),
+        level=level.strip().upper(),
+    )
+    if not word["german"] or not word["english"]:
+        empty = [key for key in ("german", "english") if not word[key]]
+        return None, Rejection("empty_value", ", ".join(empty), _fragment(entry))
+    if word["level"] not in CEFR_LEVEL_SET:
+        return None, Rejection("invalid_level", word["level"], _fragment(entry))
+    if word["article"] not in ARTICLES:
+        return None, Rejection("invalid_article", word["article"], _fragment(entry))
+    return word, None
+
+
+def parse_words(text, default_level=None) -> ParseResult:
+    """Parse a generation response into validated words and rejection reasons.
+
+    Accepts a bare object or an array of objects, optionally in a code fence
+    and surrounded by prose, and recovers the intact objects from malformed
+    or truncated responses. ``default_level`` fills in a
+    missing level.
+    """
+    rejections = []
+    fenced = _fenced_body(text)
+    try:
+        values = [json.loads(fenced if fenced is not None else text)]
+    except json.JSONDecodeError:
+        values = list(_scan_objects(text, rejections))
+        if not values and not rejections:
+            rejections.append(Rejection("no_json", "no JSON object found", _fragment(text.strip())))
+
+    words: list[WordRecord] = []
+    for value in values:
+        for entry in _entries(value):
+            word, rejection = validate_word(entry, default_level)
+            if word is not None:
+                words.append(word)
+            else:
+                rejections.append(rejection)
+    return ParseResult(words, rejections)
@@ -0,0 +1,145 @@
+import math
+from array import array
+from bisect import bisect_left, insort
+
+import numpy as np
+
+from config import SEARCH_FUZZY_THRESHOLD, SEARCH_RESULT_LIMIT
+
+# Leading words ignored when matching, so "Hund" finds "der Hund" and "dog" finds "the dog"
+GERMAN_ARTICLES = ("der", "die", "das")
+ENGLISH_ARTICLES = ("the", "a", "an", "to")
+
+
+def normalize_term(text, articles=GERMAN_ARTICLES + ENGLISH_ARTICLES):
+    """Casefold, collapse whitespace and drop a leading article"""
+    tokens = text.casefold().split()
+    if len(tokens) > 1 and tokens[0] in articles:
+        tokens = tokens[1:]
+    return " ".join(tokens)
+
+
+def trigrams(term):
+    """Set of padded character trigrams of a normalized term"""
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """In-memory prefix and trigram index over German and English vocabulary.
+
+    Words are identified by their insertion position, which matches their
+    row in ``HistoryStore``. Every word token and full term is kept in one
+    sorted key list for prefix lookups by bisection; full terms are also
+    indexed by trigram for fuzzy matches, with posting lists kept as int32
+    arrays so overlap counts are one vectorized bincount. ``add`` updates
+    both in place.
+    """
+
+    def __init__(self, words=(), fuzzy_threshold=SEARCH_FUZZY_THRESHOLD):
+        self.fuzzy_threshold = fuzzy_threshold
+        self._count = 0
+        self._keys = []
+        # Per term: owning word id and number of distinct trigrams
+        self._term_words = array("i")
+        self._term_sizes = array("i")
+        self._postings = {}
+        self.extend(words)
+
+    def __len__(self):
+        return self._count
+
+    def _index_terms(self, word):
+        word_id = self._count
+        self._count += 1
+        for field, articles in (("german", GERMAN_ARTICLES), ("english", ENGLISH_ARTICLES)):
+            term = normalize_term(word.get(field) or "", articles)
+            if not term:
+                continue
+            term_id = len(self._term_words)
+            term_trigrams = trigrams(term)
+            self._term_words.append(word_id)
+            self._term_sizes.append(len(term_trigrams))
+            for trigram in term_trigrams:
+                postings = self._postings.get(trigram)
+                if postings is None:
+                    postings = self._postings[trigram] = array("i")
+                postings.append(term_id)
+            tokens = term.split()
+            yield (term, word_id)
+            for position in range(1, len(tokens)):
+                yield (" ".join(tokens[position:]), word_id)
+
+    def add(self, word):
+        """Index one word appended to the vocabulary"""
+        for key in set(self._index_terms(word)):
+            insort(self._keys, key)
+
+    def extend(self, words):
+        """Index several words appended to the vocabulary"""
+        keys = [key for word in words for key in set(self._index_terms(word))]
+        if len(keys) > len(self._keys) // 8:
+            # Re-sorting once beats one insort per key for large batches
+            self._keys.extend(keys)
+            self._keys.sort()
+        else:
+            for key in keys:
+                insort(self._keys, key)
+
+    def prefix(self, query, limit=SEARCH_RESULT_LIMIT):
+        """Ids of words with a German or English word starting with ``query``, in key order"""
+        query = normalize_term(query)
+        if not query:
+            return []
+        seen = set()
+        ids = []
+        position = bisect_left(self._keys, (query, -1))
+        while position < len(self._keys) and len(ids) < limit:
+            key, word_id = self._keys[position]
+            if not key.startswith(query):
+                break
+            if word_id not in seen:
+                seen.add(word_id)
+                ids.append(word_id)
+            position += 1
+        return ids
+
+    def fuzzy(self, query, limit=SEARCH_RESULT_LIMIT):
+        """Ids of words whose German or English term is trigram-similar to ``query``, best first"""
+        query = normalize_term(query)
+        if not query:
+            return []
+        query_trigrams = trigrams(query)
+        postings = [self._postings[trigram] for trigram in query_trigrams if trigram in self._postings]
+        if not postings:
+            return []
+        # Trigrams each term shares with the query
+        counts = np.bincount(np.concatenate([np.frombuffer(posting, dtype=np.int32) for posting in postings]))
+
+        # A term reaching the Dice threshold shares at least min_common trigrams with the query
+        threshold = self.fuzzy_threshold
+        min_common = max(1, math.ceil(threshold * len(query_trigrams) / (2 - threshold)))
+        candidates = np.flatnonzero(counts >= min_common)
+        sizes = np.frombuffer(self._term_sizes, dtype=np.int32)[candidates]
+        scores = 2 * counts[candidates] / (len(query_trigrams) + sizes)
+        keep = scores >= threshold
+        candidates, scores = candidates[keep], scores[keep]
+
+        seen = set()
+        ids = []
+        for term_id in candidates[np.argsort(-scores, kind="stable")]:
+            word_id = self._term_words[term_id]
+            if word_id not in seen:
+                seen.add(word_id)
+                ids.append(word_id)
+                if len(ids) == limit:
+                    break
+        return ids
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        """Prefix matches, then fuzzy matches if there are fewer than ``limit``"""
+        ids = self.prefix(query, limit)
+        if len(ids) < limit:
+            seen = set(ids)
+            ids.extend(word_id for word_id in self.fuzzy(query, limit) if word_id not in seen)
+        return ids[:limit]
@@ -0,0 +1,197 @@
+import random
+from array import array
+from bisect import bisect_left, insort
+from collections import defaultdict, deque
+
+from config import EXCLUSION_PROMPT_LIMIT
+from near_duplicates import normalize_german
+from word_table import shared_table
+
+
+# Every duplicate reason; generated words are refused for any of them
+DUPLICATE_REASONS = ("exact", "variant", "near")
+
+
+def _spelling(text):
+    """Case- and whitespace-insensitive form of a word or translation"""
+    return " ".join(text.split()).casefold()
+
+
+def word_key(german):
+    """Normalize a German word for duplicate checks ("Der Hund ", "Hund" and "der hund" share a key)"""
+    return normalize_german(german)
+
+
+class VocabularyStore:
+    """Session vocabulary with hash and per-(category, level) indexes.
+
+    Iterates like the plain list it replaces. Lookups, filtered random picks
+    and category listings are O(1) or O(log n) regardless of deck size, and
+    ``exclusion_list`` never returns more than ``limit`` words.
+
+    Words live in a process-wide ``WordTable`` and the store keeps only their
+    IDs: in insertion order, sorted for membership tests, and per bucket.
+    Stored words come back as read-only ``Word`` records.
+
+    A word is a duplicate if it matches a stored word after normalization
+    (article, case, umlauts, ß), or if it is within one edit of a long
+    stored word with the same English translation. ``add`` and
+    ``count_duplicate`` tally rejected duplicates by reason in ``rejected``:
+    ``exact``, ``variant`` (same normalized key) or ``near``.
+    """
+
+    def __init__(self, words=(), limit=EXCLUSION_PROMPT_LIMIT, table=None):
+        self.limit = limit
+        self.table = shared_table if table is None else table
+        self._ids = array("I")
+        self._sorted_ids = array("I")
+        self.table.hold(self, self._ids)
+        # Every word is bucketed under (category, level), (category, None),
+        # (None, level) and (None, None) so any filter combination is one lookup
+        self._buckets = defaultdict(lambda: array("I"))
+        self._recent = defaultdict(lambda: deque(maxlen=self.limit))
+        self._category_counts = {}
+        self.rejected = {}
+        # A saved deck can hold variants the learner added by hand; keep them
+        self.extend(words, reject=("exact",))
+        # Only count duplicates offered after the initial load
+        self.rejected = {}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        table = self.table
+        return (table[word_id] for word_id in self._ids)
+
+    def __contains__(self, german):
+        return self.duplicate_reason(german) is not None
+
+    def _has(self, word_id):
+        position = bisect_left(self._sorted_ids, word_id)
+        return position < len(self._sorted_ids) and self._sorted_ids[position] == word_id
+
+    def _id_for_key(self, key):
+        for word_id in self.table.ids_for_key(key):
+            if self._has(word_id):
+                return word_id
+        return None
+
+    def get(self, german):
+        """Return the stored word matching ``german``, or None"""
+        word_id = self._id_for_key(word_key(german))
+        return None if word_id is None else self.table[word_id]
+
+    def duplicate_reason(self, german, english=None):
+        """Why ``german`` duplicates a stored word (``exact``, ``variant`` or ``near``), or None.
+
+        Near matches are only checked when ``english`` is given.
+        """
+        key = word_key(german)
+        spelling = _spelling(german)
+        reason = None
+        for word_id in self.table.ids_for_key(key):
+            if self._has(word_id):
+                if _spelling(self.table[word_id].german) == spelling:
+                    return "exact"
+                reason = "variant"
+        if reason is None and english:
+            translation = _spelling(english)
+            for candidate in self.table.near_keys(key):
+                for word_id in self.table.ids_for_key(candidate):
+                    if self._has(word_id) and _spelling(self.table[word_id].english) == translation:
+                        return "near"
+        return reason
+
+    def count_duplicate(self, german, english=None):
+        """Like ``duplicate_reason``, also counting a duplicate as rejected"""
+        reason = self.duplicate_reason(german, english)
+        if reason is not None:
+            self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        return reason
+
+    def add(self, word, reject=DUPLICATE_REASONS):
+        """Add a word; returns False (and counts the rejection) if it duplicates a known word.
+
+        Only duplicates whose reason is in ``reject`` are refused; pass
+        ``("exact",)`` for words the learner typed in themselves.
+        """
+        reason = self.duplicate_reason(word["german"], word.get("english"))
+        if reason in reject:
+            self.rejected[reason] = self.rejected.get(reason, 0) + 1
+            return False
+        word_id = self.table.add(word)
+        stored = self.table[word_id]
+        self._ids.append(word_id)
+        insort(self._sorted_ids, word_id)
+        category = stored.category
+        level = stored.level
+        for bucket in ((category, level), (category, None), (None, level), (None, None)):
+            self._buckets[bucket].append(word_id)
+            self._recent[bucket].append(word_id)
+        self._category_counts[category] = self._category_counts.get(category, 0) + 1
+        return True
+
+    def extend(self, words, reject=DUPLICATE_REASONS):
+        """Add several words; returns the stored records of the ones that were new"""
+        return [self.table[self._ids[-1]] for word in words if self.add(word, reject)]
+
+    def copy(self):
+        """Independent store with the same words and indexes, without re-checking duplicates"""
+        other = VocabularyStore(limit=self.limit, table=self.table)
+        self.table.retain(self._ids)
+        other._ids.extend(self._ids)
+        other._sorted_ids.extend(self._sorted_ids)
+        for bucket, ids in self._buckets.items():
+            other._buckets[bucket] = array("I", ids)
+        for bucket, recent in self._recent.items():
+            other._recent[bucket] = deque(recent, maxlen=self.limit)
+        other._category_counts = dict(self._category_counts)
+        return other
+
+    def random_choice(self, category=None, level=None):
+        """Pick a random word matching the filters (None matches anything), or None"""
+        bucket = self._buckets.get((category, level))
+        return self.table[random.choice(bucket)] if bucket else None
+
+    def categories(self):
+        """Categories present in the vocabulary, in first-seen order"""
+        return list(self._category_counts)
+
+    def exclusion_list(self, category=None, level=None):
+        """Most recent words matching the filters, newest first"""
+        recent = self._recent.get((category, level))
+        return [self.table[word_id].german for word_id in reversed(recent)] if recent else []
+
+
+class WordCollection:
+    """A saved collection: IDs of words in a ``WordTable``, in the order they were saved.
+
+    Iterates as ``Word`` records; ``in`` and ``append`` accept a word record or dict.
+    """
+
+    def __init__(self, words=(), table=None):
+        self.table = shared_table if table is None else table
+        self._ids = array("I")
+        self.table.hold(self, self._ids)
+        for word in words:
+            self.append(word)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        table = self.table
+        return (table[word_id] for word_id in self._ids)
+
+    def __contains__(self, word):
+        word_id = self.table.find(word)
+        return word_id is not None and word_id in self._ids
+
+    def append(self, word):
+        """Add a word to the end of the collection"""
+        self._ids.append(self.table.add(word))
+
+    def random_choice(self):
+        """Pick a random saved word, or None if the collection is empty"""
+        return self.table[random.choice(self._ids)] if self._ids else None
@@ -0,0 +1,56 @@
+import random
+import threading
+from collections import OrderedDict, defaultdict
+
+from config import SHARED_POOL_SIZE
+from vocabulary_store import word_key
+
+
+class SharedWordPool:
+    """Process-wide pool of generated words, shared by every session.
+
+    Words are bucketed by (category, level) with wildcard buckets like
+    ``VocabularyStore``, and each bucket keeps at most ``max_per_bucket``
+    of the most recently published words.
+    """
+
+    def __init__(self, max_per_bucket=SHARED_POOL_SIZE):
+        self.max_per_bucket = max_per_bucket
+        self._lock = threading.Lock()
+        self._buckets = defaultdict(OrderedDict)
+        self.hits = 0
+        self.misses = 0
+
+    def publish(self, words):
+        """Make generated words available to other sessions"""
+        with self._lock:
+            for word in words:
+                key = word_key(word["german"])
+                category = word.get("category")
+                level = word.get("level")
+                for bucket_key in ((category, level), (category, None), (None, level), (None, None)):
+                    bucket = self._buckets[bucket_key]
+                    bucket[key] = word
+                    bucket.move_to_end(key)
+                    if len(bucket) > self.max_per_bucket:
+                        bucket.popitem(last=False)
+
+    def draw(self, category, level, known_words):
+        """Return a copy of a random pooled word not in ``known_words``, or None"""
+        with self._lock:
+            bucket = self._buckets.get((category, level))
+            candidates = list(bucket.values()) if bucket else []
+            if candidates:
+                start = random.randrange(len(candidates))
+                for word in candidates[start:] + candidates[:start]:
+                    if word["german"] not in known_words:
+                        self.hits += 1
+                        return dict(word)
+            self.misses += 1
+            return None
+
+    def stats(self):
+        """Pool size and hit/miss counters for display"""
+        with self._lock:
+            bucket = self._buckets.get((None, None))
+            return {"size": len(bucket) if bucket else 0, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,134 @@
+import csv
+import os
+import threading
+import weakref
+from collections import defaultdict
+
+from config import CEFR_LEVELS, DEFAULT_VOCAB, LOCAL_WORD_LISTS_DIR, WORD_GENERATION_PROMPT
+from llm_cache import generate_fresh
+from response_parser import ARTICLES, parse_words
+from vocabulary_store import word_key
+
+# A word source answers ``new_word(category, level, known_words, existing_words)``
+# with a word dict or None. ``known_words`` supports ``in`` for every word the
+# learner already has; ``existing_words`` is the bounded list of recent words a
+# prompt can mention. Sources marked ``instant`` answer without any I/O, so
+# callers never prefetch or poll for them.
+
+
+class GeminiWordSource:
+    """One Gemini request per word"""
+
+    name = "gemini"
+    instant = False
+
+    def __init__(self, model):
+        self.model = model
+
+    def new_word(self, category=None, level=None, known_words=(), existing_words=()):
+        """Ask Gemini for a new word, raising on API errors.
+
+        Safe to call from background threads: it does not touch session state.
+        Only ``existing_words`` goes into the prompt, so callers still check the
+        result against the whole vocabulary. The request bypasses the response
+        cache, so a repeated or hedged request asks Gemini again.
+        """
+        category_prompt = f" in the category '{category}'" if category and category != "All" else ""
+        level_prompt = f" for language level '{level}'" if level and level != "All" else ""
+
+        prompt = WORD_GENERATION_PROMPT.format(
+            category_prompt=category_prompt,
+            level_prompt=level_prompt,
+            existing_words=', '.join(existing_words) if existing_words else "none"
+        )
+
+        response = generate_fresh(self.model, prompt)
+        words = parse_words(response.text, level).words
+        return words[0] if words else None
+
+
+def load_word_lists(directory=LOCAL_WORD_LISTS_DIR):
+    """DEFAULT_VOCAB followed by the bundled lists, in rank order.
+
+    ``directory`` holds one CSV per CEFR level (``A1.csv`` ... ``C2.csv``) with
+    german, english, article and category columns, most frequent words first.
+    Incomplete rows and repeats of an earlier word are skipped.
+    """
+    words = []
+    seen = set()
+
+    def add(word):
+        key = word_key(word["german"])
+        if word["german"] and word["english"] and word["category"] and word["article"] in ARTICLES and key not in seen:
+            seen.add(key)
+            words.append(word)
+
+    for word in DEFAULT_VOCAB:
+        add(dict(word))
+    for level in CEFR_LEVELS:
+        path = os.path.join(directory, f"{level}.csv")
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                add({
+                    "german": (row.get("german") or "").strip(),
+                    "english": (row.get("english") or "").strip(),
+                    "article": (row.get("article") or "").strip(),
+                    "category": (row.get("category") or "").strip(),
+                    "level": level,
+                })
+    return words
+
+
+class LocalWordSource:
+    """Bundled frequency-ranked word lists, indexed by category and CEFR level.
+
+    Words are bucketed with the same wildcard keys as ``VocabularyStore`` and
+    keep their rank order, so ``new_word`` returns the most frequent matching
+    word the learner doesn't know yet. It answers in microseconds, works
+    without an API key and is shared by every session.
+
+    A learner's known words only accumulate, so the scan for a given
+    ``known_words`` object resumes where its previous scan of the bucket stopped.
+    """
+
+    name = "local"
+    instant = True
+
+    def __init__(self, words=None):
+        self._words = load_word_lists() if words is None else list(words)
+        self._buckets = defaultdict(list)
+        for word in self._words:
+            category = word.get("category")
+            level = word.get("level")
+            for bucket in ((category, level), (category, None), (None, level), (None, None)):
+                self._buckets[bucket].append(word)
+        self._lock = threading.Lock()
+        self._resume = weakref.WeakKeyDictionary()
+
+    def __len__(self):
+        return len(self._words)
+
+    def new_word(self, category=None, level=None, known_words=(), existing_words=()):
+        """Return a copy of the highest-ranked matching word not in ``known_words``, or None"""
+        bucket_key = (category, level)
+        bucket = self._buckets.get(bucket_key, ())
+        with self._lock:
+            try:
+                positions = self._resume.setdefault(known_words, {})
+            except TypeError:
+                # Not weakly referenceable (e.g. a set): scan from the top every time
+                positions = {}
+            start = positions.get(bucket_key, 0)
+        for position in range(start, len(bucket)):
+            word = bucket[position]
+            if word["german"] not in known_words:
+                positions[bucket_key] = position
+                return dict(word)
+        positions[bucket_key] = len(bucket)
+        return None
+
+    def categories(self):
+        """Categories in the bundled lists, in rank order of their first word"""
+        return list(dict.fromkeys(word["category"] for word in self._words))
@@ -0,0 +1,175 @@
+import sys
+import threading
+import weakref
+from array import array
+from collections import deque
+from collections.abc import Mapping
+
+from config import WORD_FIELDS
+from near_duplicates import NearDuplicateIndex, normalize_german
+
+_FIELD_SET = frozenset(WORD_FIELDS)
+
+
+class Word(Mapping):
+    """Immutable word record owned by a ``WordTable``.
+
+    Reads like the word dict it replaces (``word["german"]``, ``get``,
+    ``dict(word)``) and compares equal to a mapping with the same fields.
+    ``id`` is the record's position in its table.
+    """
+
+    __slots__ = ("id", "german", "english", "article", "category", "level")
+
+    def __init__(self, word_id, german, english, article, category, level):
+        self.id = word_id
+        self.german = german
+        self.english = english
+        self.article = article
+        self.category = category
+        self.level = level
+
+    def __getitem__(self, field):
+        if field not in _FIELD_SET:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __iter__(self):
+        return iter(WORD_FIELDS)
+
+    def __len__(self):
+        return len(WORD_FIELDS)
+
+    def __repr__(self):
+        return f"Word({self.id}, {dict(self)!r})"
+
+
+class WordTable:
+    """Process-wide store of word records, shared by every session.
+
+    Each distinct record is kept once as a slotted ``Word`` with interned
+    article, category and level strings, and is identified by a dense integer
+    ID; sessions hold arrays of IDs instead of their own dicts. The table
+    also owns the normalized-key and near-duplicate indexes that
+    ``VocabularyStore`` filters by membership.
+
+    Holders ``add`` a reference per ID and ``release`` them when they go away
+    (``hold`` arranges that on garbage collection); a record nobody holds is
+    dropped, so words of ended sessions don't accumulate. Its ID is not reused.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._words = []
+        self._references = array("I")
+        # Normalized German key -> ID, or a tuple of IDs for variants like "Hund"/"der Hund"
+        self._by_key = {}
+        self._near = NearDuplicateIndex()
+        self._live = 0
+        # Filled by finalizers, which may run inside a locked section; drained under the lock
+        self._released = deque()
+
+    def __len__(self):
+        """Number of live records"""
+        return self._live
+
+    def __getitem__(self, word_id):
+        return self._words[word_id]
+
+    def ids_for_key(self, key):
+        """IDs of the records whose German word normalizes to ``key``"""
+        ids = self._by_key.get(key, ())
+        return ids if isinstance(ids, tuple) else (ids,)
+
+    def near_keys(self, key):
+        """Normalized keys of all records within one edit of ``key``"""
+        with self._lock:
+            return list(self._near.candidates(key))
+
+    def _find(self, fields, key):
+        for word_id in self.ids_for_key(key):
+            word = self._words[word_id]
+            if (word.german, word.english, word.article, word.category, word.level) == fields:
+                return word_id
+        return None
+
+    def find(self, word):
+        """ID of the record equal to ``word``, or None; takes no reference"""
+        if isinstance(word, Word) and word.id < len(self._words) and self._words[word.id] is word:
+            return word.id
+        with self._lock:
+            fields = tuple(word.get(field) or "" for field in WORD_FIELDS)
+            return self._find(fields, normalize_german(fields[0]))
+
+    def add(self, word):
+        """Intern ``word`` (a Word or any mapping with the word fields), take a reference and return its ID"""
+        with self._lock:
+            self._drain()
+            if isinstance(word, Word) and word.id < len(self._words) and self._words[word.id] is word:
+                word_id = word.id
+            else:
+                fields = tuple(word.get(field) or "" for field in WORD_FIELDS)
+                key = normalize_german(fields[0])
+                word_id = self._find(fields, key)
+                if word_id is None:
+                    word_id = self._insert(fields, key)
+            self._references[word_id] += 1
+            return word_id
+
+    def _insert(self, fields, key):
+        german, english, article, category, level = fields
+        word_id = len(self._words)
+        self._words.append(Word(word_id, german, english, sys.intern(article), sys.intern(category),
+                                sys.intern(level)))
+        self._references.append(0)
+        self._live += 1
+        ids = self._by_key.get(key)
+        if ids is None:
+            self._by_key[key] = word_id
+            self._near.add(key)
+        else:
+            self._by_key[key] = (ids if isinstance(ids, tuple) else (ids,)) + (word_id,)
+        return word_id
+
+    def retain(self, ids):
+        """Take one more reference to each ID in ``ids``, e.g. for a copy of a holder"""
+        with self._lock:
+            self._drain()
+            for word_id in ids:
+                self._references[word_id] += 1
+
+    def release(self, ids):
+        """Drop one reference per ID in ``ids``; safe to call from a finalizer"""
+        self._released.append(ids)
+
+    def hold(self, owner, ids):
+        """Release ``ids`` (an array the owner keeps appending to) once ``owner`` is garbage collected"""
+        weakref.finalize(owner, self.release, ids)
+
+    def _drain(self):
+        while self._released:
+            for word_id in self._released.popleft():
+                self._references[word_id] -= 1
+                if not self._references[word_id]:
+                    self._remove(word_id)
+
+    def _remove(self, word_id):
+        key = normalize_german(self._words[word_id].german)
+        self._words[word_id] = None
+        self._live -= 1
+        remaining = tuple(other for other in self.ids_for_key(key) if other != word_id)
+        if not remaining:
+            del self._by_key[key]
+            self._near.discard(key)
+        else:
+            self._by_key[key] = remaining if len(remaining) > 1 else remaining[0]
+
+    def stats(self):
+        """Live records and IDs handed out, for display"""
+        with self._lock:
+            self._drain()
+            return {"words": self._live, "ids": len(self._words)}
+
+
+# The table stores use unless given another; one per process
+shared_table = WordTable()